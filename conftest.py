@@ -1,11 +1,28 @@
+import json
 import sys
 import os
+
+import allure
 import pytest
 from jproperties import Properties
 
 from utils.app_constants import AppConstant
+from utils.benchmark import Benchmark
+from utils.cassette import Cassette
 from utils.config_parser import ConfigParser
-from cryptography.fernet import Fernet
+from utils.db_pool import DBConnectionPool
+from utils.golden_files import GoldenFiles
+from utils.latency_budget import LatencyBudget
+from utils.latency_recorder import LatencyRecorder
+from utils.logger import DEFAULT_BODY_LIMIT, configure_logging
+from utils.mock_server import MockAmbientServer
+from utils.note_pool import NotePool
+from utils.secret_store import SecretStore
+from utils.session_manager import SessionManager
+from utils.sharding import select_shard
+from utils.testrail.result_reporter import STATUS_FAILED, STATUS_PASSED, TestRailReporter
+
+TESTRAIL_RESULT = pytest.StashKey[dict]()
 
 
 @pytest.hookimpl(trylast=True)
@@ -47,30 +64,55 @@ def pytest_configure(config):
     if url is not None:
         configs.set_config('url', url)
 
-    #   Load & set environment variables
-    env_var_prefix = configs.get_config('environment_variable_prefix')
-
-    env_vars = os.environ
-    secret_key = os.environ.get('SECRET_KEY')
-    cipher = Fernet(secret_key)
-    for key, value in env_vars.items():
-        if key.startswith(env_var_prefix):
-            truncated_key = key.replace(env_var_prefix, '').lower()
-            decrypted_value = cipher.decrypt(str.encode(value)).decode()
-            configs.set_config(truncated_key, decrypted_value)
+    #   Encrypted environment variables are decrypted on their first read only.
+    configs.add_secrets(SecretStore(configs.get_config('environment_variable_prefix')))
 
     pytest.configs = configs
+
+    pytest.mock_server = None
+    if config.getoption('--mock-server') == 'yes':
+        pytest.mock_server = MockAmbientServer(latency=float(configs.get_config('mock_server_latency') or 0),
+                                               jitter=float(configs.get_config('mock_server_jitter') or 0),
+                                               error_rate=float(configs.get_config('mock_server_error_rate') or 0),
+                                               error_status=int(configs.get_config('mock_server_error_status') or 503))
+        pytest.mock_server.start()
+        for key in configs.keys():
+            if key.strip() == 'url' or key.strip().endswith('_url'):
+                configs.set_config(key, pytest.mock_server.rebase_url(configs.get_config(key)))
+        print(f'All API URLs point to the mock server at {pytest.mock_server.url}')
+
+    http_mode = config.getoption('--http-mode')
+    if http_mode != 'live':
+        cassette_path = config.getoption('--cassette') or os.path.join(AppConstant.CASSETTE_FOLDER, f'{env}.jsonl.gz')
+        SessionManager.use_cassette(Cassette(cassette_path, http_mode))
+    # '--log-level' (e.g. DEBUG to log request/response bodies) overrides the configured level.
+    configure_logging(level=config.getoption('log_level') or configs.get_config('log_level') or 'INFO',
+                      body_limit=int(configs.get_config('log_body_limit') or DEFAULT_BODY_LIMIT))
     pytest.url = configs.get_config('url')
     pytest.report_title = config.getoption('--report-title')
     pytest.run_skips = config.getoption('--run-skips')
     pytest.enable_jenkins = config.getoption('--enable-jenkins')
+    pytest.latency_report = config.getoption('--latency-report')
+
+    pytest.testrail_reporter = None
+    if config.getoption('--testrail-report') == 'on':
+        # Imported here as the TestRail credentials (cryptocode) are only needed when reporting.
+        from utils.testrail.user_session_handler import UserSessionManager
+        pytest.testrail_reporter = TestRailReporter(UserSessionManager().get_session(),
+                                                    configs.get_config('project_name'),
+                                                    configs.get_config('testrun_name'),
+                                                    batch_size=int(configs.get_config('testrail_batch_size') or 50),
+                                                    flush_interval=float(configs.get_config('testrail_flush_interval') or 5))
 
 
-def pytest_collection_modifyitems(items):
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
     """
     Modifies the collected test cases by adding skip marker. Test case lists are read from
     'skipped_testcases.properties' file under 'resources' folder. Test cases are listed as key
     & associated comments are placed as the value of that particular test case.
+    With '--shard-count', only the test cases of the '--shard-index' shard are kept. Runs after the '-m'/'-k'
+    deselection (trylast), so that only the selected test cases are split.
     """
     with open(AppConstant.SKIPPED_TESTCASES_FILE, 'rb') as config_file:
         temp_config = Properties()
@@ -90,6 +132,165 @@ def pytest_collection_modifyitems(items):
             else:
                 item.add_marker(pytest.mark.skipif(pytest.env == skip_info_list[0], reason=skip_info_list[1]))
 
+    shard_count = config.getoption('--shard-count')
+    if shard_count > 1:
+        shard_index = config.getoption('--shard-index')
+        if not 0 <= shard_index < shard_count:
+            raise pytest.UsageError(f'--shard-index must be between 0 and {shard_count - 1}.')
+        selected, deselected, expected_duration = select_shard(items, shard_index, shard_count,
+                                                               config.getoption('--durations-file'))
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+        print(f'\nShard {shard_index + 1}/{shard_count}: {len(selected)} test(s), ~{expected_duration:.0f}s expected')
+
+
+def pytest_generate_tests(metafunc):
+    """
+    Benchmark mode: run every test '--repeat-warmup' + '--repeat' times, as 'warmup<N>' & 'repeat<N>'
+    parametrizations of the test.
+    """
+    repeat = metafunc.config.getoption('--repeat')
+    warmup = metafunc.config.getoption('--repeat-warmup')
+    if repeat > 1 or warmup > 0:
+        metafunc.fixturenames.append('benchmark_iteration')
+        metafunc.parametrize('benchmark_iteration', Benchmark.iteration_ids(repeat, warmup), indirect=True)
+
+
+@pytest.fixture
+def benchmark_iteration(request):
+    return request.param
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    Time the wall & network time of every benchmark iteration.
+    """
+    callspec = getattr(item, 'callspec', None)
+    iteration_id = callspec.params.get('benchmark_iteration') if callspec else None
+    if iteration_id is None:
+        yield
+        return
+
+    started = Benchmark.start()
+    outcome = yield
+    Benchmark.stop(item, iteration_id, started, passed=outcome.excinfo is None)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Queue the result of the TestRail cases of the test's 'testrail' marker with '--testrail-report=on'. A
+    single final status is queued once the teardown is reported: failed if any of the setup, call or
+    teardown failed, passed if the call passed. The results are posted in batches by a background thread,
+    not by the test itself.
+    """
+    outcome = yield
+    report = outcome.get_result()
+    marker = item.get_closest_marker('testrail')
+    if not getattr(pytest, 'testrail_reporter', None) or marker is None:
+        return
+    result = item.stash.setdefault(TESTRAIL_RESULT, {'status_id': None, 'comment': '', 'elapsed': 0.0})
+    result['elapsed'] += report.duration
+    if report.failed and result['status_id'] != STATUS_FAILED:
+        result['status_id'] = STATUS_FAILED
+        result['comment'] = f'{report.when} failed: {call.excinfo.exconly() if call.excinfo else ""}'
+    elif report.when == 'call' and report.passed:
+        result['status_id'] = STATUS_PASSED
+    if report.when == 'teardown' and result['status_id'] is not None:
+        for case_id in marker.args:
+            pytest.testrail_reporter.add_result(case_id, result['status_id'], result['comment'],
+                                                elapsed=result['elapsed'])
+
+
+def worker_report_path(report_path):
+    """
+    Suffix a report file name with the xdist worker id (e.g. report_gw0.json) when running in parallel.
+    """
+    worker = os.environ.get('PYTEST_XDIST_WORKER')
+    if not worker:
+        return report_path
+    root, extension = os.path.splitext(report_path)
+    return f'{root}_{worker}{extension}'
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Write the benchmark report of '--repeat' runs, post the remaining TestRail results, and close the pooled HTTP sessions, DB connections & SSH
+    tunnels shared by the suites (and stop the mock server) once the whole run is over.
+    """
+    if Benchmark.results:
+        report_path = worker_report_path(session.config.getoption('--repeat-report'))
+        Benchmark.save_report(report_path)
+        print(f'\nBenchmark report written to {report_path}')
+    if SessionManager.cassette:
+        SessionManager.cassette.save()
+    if getattr(pytest, 'testrail_reporter', None):
+        pytest.testrail_reporter.close()
+        pytest.testrail_reporter.session.close()
+    SessionManager.close_all()
+    DBConnectionPool.close_all()
+    if getattr(pytest, 'mock_server', None):
+        pytest.mock_server.stop()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def latency_report():
+    """
+    Attach the per-endpoint latency percentiles of the whole session to the Allure report, and write them to
+    the '--latency-report' file if given (one file per xdist worker).
+    """
+    yield
+    if not LatencyRecorder.samples:
+        return
+
+    if pytest.latency_report:
+        report_path = worker_report_path(pytest.latency_report)
+        report = LatencyRecorder.save_report(report_path)
+        print(f'Latency report written to {report_path}')
+    else:
+        report = LatencyRecorder.report()
+    allure.attach(json.dumps(report, indent=4), name='Latency per endpoint', attachment_type=allure.attachment_type.JSON)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def note_pool():
+    """
+    Session-wide pool of pre-provisioned notes leased by the suites' setup. 'note_pool_size' notes of the
+    AUTH_TOKEN provider are created up front (0 to create them in batches on first lease); every pooled note
+    is deleted at the end of the session.
+    """
+    pool_size = int(pytest.configs.get_config('note_pool_size') or 0)
+    if pool_size > 0 and os.environ.get('AUTH_TOKEN'):
+        NotePool.provision(os.environ['AUTH_TOKEN'], pool_size)
+    yield NotePool
+    NotePool.cleanup()
+
+
+@pytest.fixture(scope='session')
+def golden_files():
+    """
+    Read-only golden files of 'resources/json_data', parsed once per session, e.g.
+    golden_files.load('resources/json_data/complaints_selection.json') or
+    golden_files.index('resources/json_data/complaints_selection.json', 'complaints_by_id').
+    """
+    return GoldenFiles
+
+
+@pytest.fixture
+def latency_budget(request):
+    """
+    LatencyBudget configured by the test's 'latency_budget' marker, e.g.
+    @pytest.mark.latency_budget(p95=800, calls=20, endpoint='POST provider/patients'). The measured
+    percentiles are attached to the Allure report.
+    """
+    marker = request.node.get_closest_marker('latency_budget')
+    budget = LatencyBudget(*marker.args, **marker.kwargs) if marker else LatencyBudget()
+    yield budget
+    if budget.summary:
+        allure.attach(budget.breakdown(), name='Latency budget', attachment_type=allure.attachment_type.TEXT)
+
+
 @pytest.fixture(autouse=True)
 def setup_testcase(request):
     request.cls.tc_name = request.node.name
@@ -102,7 +303,33 @@ def pytest_addoption(parser):
     parser.addoption('--url', action='store', help='url: dev, demo, staging or production url. If it is provided,'
                                                    'this value will override the value provided by config file.')
     parser.addoption('--repeat', action='store', type=int,
-                     default=1, help='Run eah test specified number of times.')
+                     default=1, help='Run each test specified number of times and report the wall & network time '
+                                     'statistics of every test to --repeat-report.')
+    parser.addoption('--repeat-warmup', action='store', type=int, default=0,
+                     help='Number of extra, unmeasured runs of each test before the --repeat ones.')
+    parser.addoption('--repeat-report', action='store', default='benchmark_report.json',
+                     help='JSON file the --repeat statistics are written to.')
+    parser.addoption('--http-mode', action='store', default='live', choices=('live', 'record', 'replay'),
+                     help='live: send requests to the API, record: also store them in the cassette, '
+                          'replay: serve the responses from the cassette without any network access.')
+    parser.addoption('--cassette', action='store', help='Cassette file used by --http-mode=record/replay. '
+                                                        'Default is resources/cassettes/<env>.jsonl.gz.')
+    parser.addoption('--mock-server', action='store', default='no',
+                     help='Run against the local stand-in of the Ambient APIs (utils/mock_server.py) instead of '
+                          'the real backends. --mock-server=no by default.')
+    parser.addoption('--latency-report', action='store',
+                     help='Write the per-endpoint latency percentiles (time to response headers & total time) of the run to '
+                          'this JSON file.')
+    parser.addoption('--shard-count', action='store', type=int, default=1,
+                     help='Split the collected tests into this many shards of about the same duration.')
+    parser.addoption('--shard-index', action='store', type=int, default=0,
+                     help='Zero based index of the shard to run, with --shard-count.')
+    parser.addoption('--durations-file', action='store', default=AppConstant.TEST_DURATIONS_FILE,
+                     help='Historical test durations used for sharding, updated by '
+                          '"python -m utils.sharding -junit <junit xml files>".')
+    parser.addoption('--testrail-report', action='store', default='off', choices=('on', 'off'),
+                     help='Report the result of the tests marked with the TestRail case IDs, e.g. '
+                          '@pytest.mark.testrail("C1234"), to the TestRail run of testrail.properties.')
     parser.addoption('--report-title', action='store', default='Lynx API Automation Report')
     parser.addoption('--run-skips', action='store', default='no', help='Enable skipped test cases.')
     parser.addoption('--enable-jenkins', action='store', default='no', help='Enable running from local machine/Jenkins.'
@@ -1,12 +1,12 @@
 from urllib import response
 import jwt
-import pytest
 from jwt import DecodeError
 import json
 import random
 import uuid
 from pages.base_page import BasePage
 from utils.api_request_data_handler import APIRequestDataHandler
+from utils.config_parser import Config
 from utils.helper import get_formatted_date_str
 from utils.request_handler import RequestHandler
 from pages.appointment_api_page import AppointmentsApiPage
@@ -17,8 +17,8 @@ class AppSyncApiPage(BasePage):
         self.appointment = AppointmentsApiPage()
     #     super().__init__(db)
 
-    auth_base_url = pytest.configs.get_config('authorization_base_url')
-    ml_base_url = pytest.configs.get_config('ml_base_url')
+    auth_base_url = Config('authorization_base_url')
+    ml_base_url = Config('ml_base_url')
 
     def post_transcript(self, user_name, password):
         # Create and get note id and guid
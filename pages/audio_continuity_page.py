@@ -1,6 +1,6 @@
 # pylint: disable=no-member, attribute-defined-outside-init
 import json
-import pytest
+from utils.config_parser import Config
 from utils.request_handler import RequestHandler
 from utils.api_request_data_handler import APIRequestDataHandler
 from utils.helper import get_current_pst_time, get_formatted_date_str
@@ -16,7 +16,7 @@ class AudioContinuityPage(BasePage):
         self.request_data = APIRequestDataHandler('audio_continuity')
         #super().__init__()
 
-    base_url = pytest.configs.get_config('audio_continuity_base_url')
+    base_url = Config('audio_continuity_base_url')
     
     def post_audio(self, note_id, recording_id, user_name=None, password=None, auth_token=None, payload=None):
         """
@@ -5,11 +5,11 @@ import random
 import uuid
 
 import jwt
-import pytest
 from jwt import DecodeError
 
 from pages.base_page import BasePage
 from utils.api_request_data_handler import APIRequestDataHandler
+from utils.config_parser import Config
 from utils.helper import get_formatted_date_str
 from utils.request_handler import RequestHandler
 
@@ -18,7 +18,7 @@ class AuthorizationApiPage(BasePage):
     # def __init__(self, db):
     #     super().__init__(db)
 
-    base_url = pytest.configs.get_config('authorization_base_url')
+    base_url = Config('authorization_base_url')
 
     def create_resource(self, user_name=None, password=None, request_type='POST', auth_token=None, note_id=None, authorize_path='authorize'):
 
@@ -1,10 +1,16 @@
 # pylint: disable=no-member
-import pytest
+import asyncio
+import copy
+import functools
+import inspect
+
+from utils.api_request_data_handler import APIRequestDataHandler
+from utils.config_parser import Config
 from utils.request_handler import RequestHandler
 
 
 class BasePage:
-    provider_url = pytest.configs.get_config('provider_base_url')
+    provider_url = Config('provider_base_url')
 
     def reset_password(self, token=None, headers=None, new_password="newAugPass@#"):
         path_reset_password = f'providers/me/password?newPassword={new_password}'
@@ -17,6 +23,52 @@ class BasePage:
         if response.status_code == 200:
             print("Password Changed")
 
+    def __getattr__(self, name):
+        """
+        Provide an asyncio variant of every page method: `await page.async_<method>(...)` runs
+        `page.<method>(...)` on a worker thread, so independent flows can be awaited concurrently on one
+        event loop while the sync methods stay untouched. As the page methods modify their request data in
+        place, every call runs on an isolated copy of the page (see isolated_copy).
+        """
+        if name.startswith('async_') and callable(getattr(self, name[len('async_'):], None)):
+            method_name = name[len('async_'):]
+
+            @functools.wraps(getattr(self, method_name))
+            async def async_method(*args, **kwargs):
+                return await asyncio.to_thread(getattr(self.isolated_copy(), method_name), *args, **kwargs)
+            return async_method
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def isolated_copy(self):
+        """
+        Shallow copy of the page with private copies of its request data, and of the request data of its
+        nested pages, so that concurrent calls never share headers or payloads.
+        """
+        page = copy.copy(self)
+        for name, value in list(vars(page).items()):
+            if isinstance(value, APIRequestDataHandler):
+                request_data = copy.copy(value)
+                request_data.request_data = APIRequestDataHandler.copy_json(value.request_data)
+                setattr(page, name, request_data)
+            elif isinstance(value, BasePage):
+                setattr(page, name, value.isolated_copy())
+        return page
+
+    @staticmethod
+    def run_concurrently(*coroutines):
+        """
+        Run the given coroutines concurrently on a new event loop and return their results in order, e.g.
+        `BasePage.run_concurrently(page.async_create_ambient_appointment(auth_token=token) for _ in range(5))`.
+        A single iterable of coroutines is accepted as well.
+        """
+        if len(coroutines) == 1 and not inspect.iscoroutine(coroutines[0]):
+            coroutines = tuple(coroutines[0])
+
+        async def gather():
+            return await asyncio.gather(*coroutines)
+
+        return asyncio.run(gather())
+
     # def __init__(self, db):
     #     self.db = db
     #
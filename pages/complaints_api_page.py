@@ -4,12 +4,12 @@ import random
 import uuid
 
 import jwt
-import pytest
 from jwt import DecodeError
 
 from pages.base_page import BasePage
 from resources.data import Data
 from utils.api_request_data_handler import APIRequestDataHandler
+from utils.config_parser import Config
 from utils.dbConfig import DB
 from utils.helper import get_formatted_date_str
 from utils.request_handler import RequestHandler
@@ -20,7 +20,7 @@ class ComplaintsApiPage(BasePage):
         self.db_manager = db_manager
 
     # Complaints
-    note_builder_schema_name=pytest.configs.get_config("note_builder_schema_name")
+    note_builder_schema_name=Config("note_builder_schema_name")
 
     def get_first_complaints(self, complaint_type):
         query_data = self.db_manager.execute_query(f"SELECT id, name FROM  {self.note_builder_schema_name}.complaint where type='{complaint_type}' and is_published=1 order by rand() limit 1;")
@@ -4,11 +4,11 @@ import random
 import uuid
 
 import jwt
-import pytest
 from jwt import DecodeError
 
 from pages.base_page import BasePage
 from utils.api_request_data_handler import APIRequestDataHandler
+from utils.config_parser import Config
 from utils.helper import get_formatted_date_str
 from utils.request_handler import RequestHandler
 
@@ -16,7 +16,7 @@ start_date = get_formatted_date_str(_days=3, _date_format='%Y-%m-%d')
 end_date = get_formatted_date_str(_date_format='%Y-%m-%d')
 
 class EHRUploadApiPage(BasePage):
-    base_url = pytest.configs.get_config('ehr_base_url')
+    base_url = Config('ehr_base_url')
 
     def get_appointment(self, user_name=None, password=None, doctor_id=None, auth_token=None):
         request_path = f'lynx/appointments?doctorId={doctor_id}&startDate={end_date}&cache.invalidateCache=true&localSearch=false'
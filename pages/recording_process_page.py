@@ -1,7 +1,7 @@
 # pylint: disable=no-member, attribute-defined-outside-init
 import json
 import pytest
-import time
+from utils.poller import Poller
 from utils.request_handler import RequestHandler
 from pages.base_page import BasePage
 from utils.api_request_data_handler import APIRequestDataHandler
@@ -118,20 +118,18 @@ class RecordingProcessPage(BasePage):
         Poll the status of a recording process until it is COMPLETED or max retries are reached.
         """
         token = auth_token if auth_token else RequestHandler.get_auth_token(user_name=user_name, password=password)
-        
-        headers = self.request_data.get_modified_headers(Authorization=f'Bearer {token}')
-        for attempt in range(max_retries):
+
+        def fetch_recording_process():
             response = self.get_recording_process(note_id, auth_token=token)
-            status = response.get("status")
-            print(f"Polling attempt {attempt + 1}: Status = {status}")
-
-            if status == "COMPLETED":
-                print("Recording process completed.")
-                return response
-            elif status == "PROCESSING":
-                print("Recording process is still processing. Retrying...")
-                time.sleep(interval)
-            else:
-                raise AssertionError(f"Unexpected status: {status}")
-
-        raise AssertionError("Recording process did not complete within the expected time.")
\ No newline at end of file
+            recording_process = response.json() if hasattr(response, 'json') else response
+            if isinstance(recording_process, list):
+                recording_process = recording_process[0] if recording_process else {}
+            print(f"Recording process status: {recording_process.get('status')}")
+            return recording_process
+
+        poller = Poller(timeout=max_retries * interval, interval=1, max_interval=interval)
+        return poller.poll(fetch_recording_process,
+                           until=lambda recording_process: recording_process.get("status") == "COMPLETED",
+                           fail_when=lambda recording_process: recording_process.get("status") != "PROCESSING",
+                           description="Recording process",
+                           timeout_error=AssertionError)
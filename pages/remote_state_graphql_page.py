@@ -1,17 +1,17 @@
 # pylint: disable=no-member, attribute-defined-outside-init
 from urllib import response
 import jwt
-import pytest
 from jwt import DecodeError
 import json
 import random
 import uuid
 from pages.base_page import BasePage
 from utils.api_request_data_handler import APIRequestDataHandler
+from utils.config_parser import Config
 from utils.helper import get_formatted_date_str
 from utils.request_handler import RequestHandler
 from pages.appointments_api_page import AppointmentsApiPage
-import time
+from utils.poller import Poller
 
 
 class RemoteStateGraphQLApiPage(BasePage):
@@ -19,8 +19,8 @@ class RemoteStateGraphQLApiPage(BasePage):
         self.appointment = AppointmentsApiPage()
     #     super().__init__(db)
 
-    auth_base_url = pytest.configs.get_config('authorization_base_url')
-    ml_base_url = pytest.configs.get_config('ml_base_url')
+    auth_base_url = Config('authorization_base_url')
+    ml_base_url = Config('ml_base_url')
 
     def post_transcript(self, user_name, password, max_wait=60):
         # Create and get note id and guid
@@ -36,16 +36,11 @@ class RemoteStateGraphQLApiPage(BasePage):
         json_payload = request_data.get_modified_payload(note_id=note_id, clinician_id=user_guid)
         payload = json.dumps(json_payload, indent=4)
         # Post a transcript
-        start_time = time.time()
-        while True:
-            response = RequestHandler.get_api_response(base_url=self.ml_base_url, request_path='ml_service',
-                                                request_type='POST', payload=payload, headers=headers)
-            if response.status_code == 200:
-                break
-            if time.time() - start_time > max_wait:
-                print("Max time limit reached. Transcription took too long")
-                break
-            time.sleep(1)
+        poller = Poller(timeout=max_wait, interval=1, max_interval=5)
+        poller.poll(lambda: RequestHandler.get_api_response(base_url=self.ml_base_url, request_path='ml_service',
+                                                            request_type='POST', payload=payload, headers=headers),
+                    until=lambda response: response.status_code == 200,
+                    description="Transcription", timeout_error=None)
         
         return headers, user_guid, appointment_id, note_id 
         
@@ -1,7 +1,7 @@
 # pylint: disable=no-member, attribute-defined-outside-init
 import json
 import pytest
-import time
+from utils.poller import Poller
 from utils.request_handler import RequestHandler
 from pages.base_page import BasePage
 from utils.api_request_data_handler import APIRequestDataHandler
@@ -33,12 +33,12 @@ class TranscriptApiPage(BasePage):
             raise ValueError(f"Failed to create recording process: {recording_response}")
 
         # Step 3: Poll the recording process until streamId is not null or blank
-        for attempt in range(max_retries):
+        def fetch_stream_id():
             response = self.recording_api_page.get_recording_process(
                 note_id=note_id,
                 auth_token=auth_token
             )
-            print(f"Polling attempt {attempt + 1}: Recording Details: {response}")
+            print(f"Recording Details: {response}")
 
             # Parse the response into JSON
             try:
@@ -50,15 +50,14 @@ class TranscriptApiPage(BasePage):
                 recording_process = recording_details[0]
                 recording_containers = recording_process.get("recordingProcessContainers", [])
                 if len(recording_containers) > 0:
-                    stream_id = recording_containers[0].get("streamId")
-                    if stream_id:  # Check if streamId is not null or blank
-                        print(f"Stream ID found: {stream_id}")
-                        return stream_id
-
-            print("Stream ID is still null or blank. Retrying...")
-            time.sleep(interval)
-
-        raise TimeoutError("Stream ID was not available within the expected time.")
+                    return recording_containers[0].get("streamId")
+            return None
+
+        poller = Poller(timeout=max_retries * interval, interval=1, max_interval=interval)
+        stream_id = poller.poll(fetch_stream_id, until=bool, description="Stream ID",
+                                timeout_error=TimeoutError)
+        print(f"Stream ID found: {stream_id}")
+        return stream_id
     
     
     def upload_audio_to_go_note(self, auth_token, note_id, file_path):
@@ -122,20 +121,24 @@ class TranscriptApiPage(BasePage):
         """
         Poll the status of a transcript until it is COMPLETED or max retries are reached.
         """
-        headers = self.request_data.get_modified_headers(Authorization=f"Bearer {auth_token}")
-        for attempt in range(max_retries):
-            response = self.get_transcript(stream_id, auth_token=auth_token)
-            response_json = response.json()
-            status = response_json.get("status")
-            print(f"Polling attempt {attempt + 1}: Status = {status}")
+        return self.poll_transcripts_status([stream_id], auth_token, max_retries=max_retries,
+                                            interval=interval)[stream_id]
 
-            if status == "COMPLETED":
-                print("Transcript process completed.")
+    def poll_transcripts_status(self, stream_ids, auth_token, max_retries=10, interval=5):
+        """
+        Poll the status of several transcripts concurrently until all of them are COMPLETED.
+        Returns a dictionary of stream ID -> final transcript response.
+        """
+        def transcript_fetcher(stream_id):
+            def fetch_transcript():
+                response_json = self.get_transcript(stream_id, auth_token=auth_token).json()
+                print(f"Transcript {stream_id}: Status = {response_json.get('status')}")
                 return response_json
-            elif status == "PROCESSING":
-                print("Transcript process is still processing. Retrying...")
-                time.sleep(interval)
-            else:
-                raise AssertionError(f"Unexpected status: {status}")
-
-        raise AssertionError("Transcript process did not complete within the expected time.")
\ No newline at end of file
+            return fetch_transcript
+
+        poller = Poller(timeout=max_retries * interval, interval=1, max_interval=interval)
+        return poller.poll_many({stream_id: transcript_fetcher(stream_id) for stream_id in stream_ids},
+                                until=lambda response_json: response_json.get("status") == "COMPLETED",
+                                fail_when=lambda response_json: response_json.get("status") != "PROCESSING",
+                                description="Transcript process",
+                                timeout_error=AssertionError)
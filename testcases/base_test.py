@@ -1,12 +1,13 @@
 import pytest
 
 from resources.data import Data
+from utils.config_parser import Config
 from utils.dbConfig import DB
 from utils.request_handler import RequestHandler
 
 
 class BaseTest:
-    provider_url = pytest.configs.get_config('provider_base_url')
+    provider_url = Config('provider_base_url')
     user_name = ''
     password_hash = ''
 
@@ -20,6 +21,8 @@ class BaseTest:
                                                                             self.data.doctorStatusPlaceholder, 'active')
         print(f'Query: {query_updated}')
         self.db.execute_query(query_updated)
+        # Tokens issued before the user got blocked are revoked on the server side.
+        RequestHandler.invalidate_auth_token(user_name=self.user_name)
 
     @pytest.fixture
     def setup_for_password_reset_testcases(self):
@@ -29,3 +32,5 @@ class BaseTest:
         password_reset_query = self.data.update_dr_password_query.replace(self.data.doctorEmailPlaceholder, self.user_name).replace(
                                                                                     self.data.doctorPasswordHashPlaceholder, self.password_hash)
         self.db.execute_query(password_reset_query)
+        # Tokens issued before the password reset are revoked on the server side.
+        RequestHandler.invalidate_auth_token(user_name=self.user_name)
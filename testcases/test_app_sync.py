@@ -1,6 +1,5 @@
 from urllib import response
 
-import jsondiff
 import requests
 import json
 import pytest
@@ -9,15 +8,15 @@ from pages.app_sync_api_page import AppSyncApiPage
 from pages.remote_state_graphql_page import RemoteStateGraphQLApiPage
 from resources.data import Data
 from testcases.base_test import BaseTest
+from utils.schema_registry import SchemaRegistry
 from utils.api_request_data_handler import APIRequestDataHandler
 from utils.dbConfig import DB
 from utils.helper import get_formatted_date_str
+from utils.json_similarity import assert_json_similar
 from utils.request_handler import RequestHandler
 import jwt
 import allure
 import re
-import jsonschema
-from jsonschema.validators import  validate, Draft7Validator, create
 
 
 class TestAppSync(BaseTest):
@@ -50,23 +49,18 @@ class TestAppSync(BaseTest):
 
     @allure.severity(allure.severity_level.BLOCKER)
     @pytest.mark.sanity
-    def test_get_all_complaints_selection_of_a_note_for_valid_lynx_enabled_rt_token(self):
+    def test_get_all_complaints_selection_of_a_note_for_valid_lynx_enabled_rt_token(self, golden_files):
         response_body = RequestHandler.get_api_response(base_url=self.app_sync_base_url, request_path=self.app_sync_path,
                                                         request_type="POST", payload=self.payload, headers=self.headers)
-        with open('resources/json_data/app_sync_response.json', 'r') as json_file:
-            expected_response = json.loads(json_file.read())
+        expected_response = golden_files.load('resources/json_data/app_sync_response.json')
         with allure.step('Proper dataset, status_code and reason should be returned'):
             assert response_body.status_code == 200
             assert response_body.reason == 'OK'
             json_response = response_body.json()
-            # Calculate the percentage similarity
-            similarity = jsondiff.similarity(json_response, expected_response)
-            assert similarity >= 0.90, "JSON files are not at least 90% similar"
+            assert_json_similar(expected_response, json_response, threshold=0.90)
             # assert json_response == expected_response
-        with open('resources/json_data/app_sync_response_schema.json', 'r') as json_file:
-            expected_schema = json.loads(json_file.read())
         with allure.step('json schema is validated'):
-            assert validate(json_response, expected_schema) is None
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/app_sync_response_schema.json') is None
                 
 
     @allure.severity(allure.severity_level.BLOCKER)
@@ -6,6 +6,7 @@ from utils.helper import validate_response_schema
 from pages.appointments_api_page import AppointmentsApiPage
 from pages.audio_continuity_page import AudioContinuityPage
 from testcases.base_test import BaseTest
+from utils.note_pool import NotePool
 
 
 class TestAudioContinuity(BaseTest):
@@ -32,7 +33,7 @@ class TestAudioContinuity(BaseTest):
             self.start_time_str,
             self.visit_end_time,
             self.response_body,
-        ) = self.appointment_page.create_ambient_appointment(auth_token=self.token)
+        ) = NotePool.lease(auth_token=self.token)
         
         # Get provider GUID and construct recordingId
         self.provider_guid = self.appointment_page.get_provider_guid(self.token)
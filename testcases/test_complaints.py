@@ -1,12 +1,11 @@
-import json
 
 import allure
 import pytest
-from jsonschema.validators import validate
 
 from pages.complaints_api_page import ComplaintsApiPage
 from resources.data import Data
 from testcases.base_test import BaseTest
+from utils.schema_registry import SchemaRegistry
 from utils.db_manager import DBManager
 from utils.request_handler import RequestHandler
 
@@ -64,10 +63,8 @@ class TestComplaints(BaseTest):
             expected_variation_id_list.sort()
             print(f'Actual: {actual_variation_id}\nExpected: {expected_variation_id_list}')
             assert actual_variation_id == expected_variation_id_list
-        with open('resources/json_data/acute_complaints_data_isMobile_true_schema.json', 'r') as json_file:
-            expected_schema = json.loads(json_file.read())
         with allure.step('json schema is validated'):
-            assert validate(json_response, expected_schema) is None    
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/acute_complaints_data_isMobile_true_schema.json') is None    
 
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.sanity
@@ -98,10 +95,8 @@ class TestComplaints(BaseTest):
             expected_variation_id_list.sort()
             print(f'Actual: {actual_variation_id}\nExpected: {expected_variation_id_list}')
             assert actual_variation_id == expected_variation_id_list
-        with open('resources/json_data/chronic_complaints_data_isMobile_true_schema.json', 'r') as json_file:
-            expected_schema = json.loads(json_file.read())
         with allure.step('json schema is validated'):
-            assert validate(json_response, expected_schema) is None    
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/chronic_complaints_data_isMobile_true_schema.json') is None    
 
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.sanity
@@ -133,10 +128,8 @@ class TestComplaints(BaseTest):
             expected_variation_id_list.sort()
             print(f'Actual: {actual_variation_id}\nExpected: {expected_variation_id_list}')
             assert actual_variation_id == expected_variation_id_list
-        with open('resources/json_data/visit_complaints_data_isMobile_true_schema.json', 'r') as json_file:
-            expected_schema = json.loads(json_file.read())
         with allure.step('json schema is validated'):
-            assert validate(json_response, expected_schema) is None    
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/visit_complaints_data_isMobile_true_schema.json') is None    
 
 
     @allure.severity(allure.severity_level.CRITICAL)
@@ -248,10 +241,8 @@ class TestComplaints(BaseTest):
             expected_variation_id_list.sort()
             print(f'Actual: {actual_variation_id}\nExpected: {expected_variation_id_list}')
             assert actual_variation_id == expected_variation_id_list
-        with open('resources/json_data/acute_complaints_data_isMobile_false_schema.json', 'r') as json_file:
-            expected_schema = json.loads(json_file.read())
         with allure.step('json schema is validated'):
-            assert validate(json_response, expected_schema) is None    
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/acute_complaints_data_isMobile_false_schema.json') is None    
 
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.sanity
@@ -283,10 +274,8 @@ class TestComplaints(BaseTest):
             expected_variation_id_list.sort()
             print(f'Actual: {actual_variation_id}\nExpected: {expected_variation_id_list}')
             assert actual_variation_id == expected_variation_id_list
-        with open('resources/json_data/chronic_complaints_data_isMobile_false_schema.json', 'r') as json_file:
-            expected_schema = json.loads(json_file.read())
         with allure.step('json schema is validated'):
-            assert validate(json_response, expected_schema) is None   
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/chronic_complaints_data_isMobile_false_schema.json') is None   
 
 
     @allure.severity(allure.severity_level.CRITICAL)
@@ -319,10 +308,8 @@ class TestComplaints(BaseTest):
             expected_variation_id_list.sort()
             print(f'Actual: {actual_variation_id}\nExpected: {expected_variation_id_list}')
             assert actual_variation_id == expected_variation_id_list
-        with open('resources/json_data/visit_complaints_data_isMobile_false_schema.json', 'r') as json_file:
-            expected_schema = json.loads(json_file.read())
         with allure.step('json schema is validated'):
-            assert validate(json_response, expected_schema) is None   
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/visit_complaints_data_isMobile_false_schema.json') is None   
 
 
 
@@ -406,14 +393,13 @@ class TestComplaints(BaseTest):
 
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.sanity
-    def test_get_all_notebuilder_complaints(self):
+    def test_get_all_notebuilder_complaints(self, golden_files):
         request_path = f'complaints'
         response = RequestHandler.get_api_response(user_name=pytest.configs.get_config("lynx_enabled_rt_provider"),
                                                    password=pytest.configs.get_config("all_provider_password"),
                                                    base_url=self.base_url, request_path=request_path)
         json_response = response.json()
-        with open('resources/json_data/notebuilder_complaints_all_data.json', 'r') as json_file:
-            expected_response = json.loads(json_file.read())
+        expected_response = golden_files.load('resources/json_data/notebuilder_complaints_all_data.json')
         with allure.step('Proper dataset, status_code and reason should be returned'):
             assert response.status_code == 200
             assert response.reason == 'OK'
@@ -570,7 +556,5 @@ class TestComplaints(BaseTest):
             expected_variation_id_list.sort()
             print(f'Actual: {actual_variation_id}\nExpected: {expected_variation_id_list}')
             assert actual_variation_id == expected_variation_id_list
-        with open('resources/json_data/visit_complaints_data_isMobile_false_schema.json', 'r') as json_file:
-            expected_schema = json.loads(json_file.read())
         with allure.step('json schema is validated'):
-            assert validate(json_response, expected_schema) is None
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/visit_complaints_data_isMobile_false_schema.json') is None
@@ -1,20 +1,20 @@
 
 from urllib import response
 import requests
-import json
 import pytest
 
 from pages.appointment_api_page import AppointmentsApiPage
 from testcases.base_test import BaseTest
+from utils.schema_registry import SchemaRegistry
 from utils.helper import get_formatted_date_str
 from utils.request_handler import RequestHandler
+from utils.row_validator import EHR_APPOINTMENT_ROWS
 import jwt
 import allure
 import datetime
 import re
 from utils.dbConfig import DB
 from resources.data import Data
-from jsonschema.validators import  validate
 
 start_date = get_formatted_date_str(_days=-3, _date_format='%Y-%m-%d')
 end_date = get_formatted_date_str(_date_format='%Y-%m-%d')
@@ -40,19 +40,10 @@ class TestEHRAppointments(BaseTest):
             assert json_response['message'] == 'success'
             assert json_response['code'] == '000'
             data_list = json_response['dataList']
-            for data in data_list:
-                assert len(data['uuid']) == 36
-                assert len(data['appointmentId']) == 7
-                assert re.fullmatch(r'\d+', data['patientId'])
-                assert len(data['patientFirstName']) > 0
-                assert re.fullmatch(r'\d{4}-\d{2}-\d{2}', data['patientBirthDate'])
-                assert re.fullmatch(r'[mfoMFO]', data['patientGender'])
-                assert re.fullmatch(r'\d{2}:\d{2} [AP]M', data['appointmentStartTime'])
-
-        with open('resources/json_data/ehr_appointments_schema.json', 'r') as json_file:
-            expected_schema = json.loads(json_file.read())
+            EHR_APPOINTMENT_ROWS.assert_valid(data_list)
+
         with allure.step('json schema is validated'):
-            assert validate(json_response, expected_schema) is None
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/ehr_appointments_schema.json') is None
 
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.sanity
@@ -69,14 +60,7 @@ class TestEHRAppointments(BaseTest):
             assert json_response['message'] == 'success'
             assert json_response['code'] == '000'
             data_list = json_response['dataList']
-            for data in data_list:
-                assert len(data['uuid']) == 36
-                assert len(data['appointmentId']) == 7
-                assert re.fullmatch(r'\d+', data['patientId'])
-                assert len(data['patientFirstName']) > 0
-                assert re.fullmatch(r'\d{4}-\d{2}-\d{2}', data['patientBirthDate'])
-                assert re.fullmatch(r'[mfoMFO]', data['patientGender'])
-                assert re.fullmatch(r'\d{2}:\d{2} [AP]M', data['appointmentStartTime'])
+            EHR_APPOINTMENT_ROWS.assert_valid(data_list)
 
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.sanity
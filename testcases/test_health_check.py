@@ -0,0 +1,42 @@
+import allure
+import pytest
+
+from testcases.base_test import BaseTest
+from utils.config_parser import Config
+from utils.request_handler import RequestHandler
+from utils.schema_registry import SchemaRegistry
+
+
+class TestHealthCheck(BaseTest):
+    auth_base_url = Config('auth_base_url')
+    appointments_base_url = Config('appointments_base_url')
+
+    @allure.severity(allure.severity_level.BLOCKER)
+    @pytest.mark.health_check
+    @pytest.mark.latency_budget(p95=800, calls=10, endpoint='GET health')
+    def test_auth_service_health(self, latency_budget):
+        response = latency_budget.measure(
+            lambda: RequestHandler.get_response(base_url=self.auth_base_url, request_path='health'))
+
+        with allure.step('Auth service should be UP'):
+            assert response.status_code == 200
+            json_response = response.json()
+            assert json_response['status'] == 'UP'
+
+        with allure.step('json schema is validated'):
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/auth_health_schema.json') is None
+
+    @allure.severity(allure.severity_level.BLOCKER)
+    @pytest.mark.health_check
+    @pytest.mark.latency_budget(p95=800, calls=10, endpoint='GET health')
+    def test_appointment_service_health(self, latency_budget):
+        response = latency_budget.measure(
+            lambda: RequestHandler.get_response(base_url=self.appointments_base_url, request_path='health'))
+
+        with allure.step('Appointment service should be UP'):
+            assert response.status_code == 200
+            json_response = response.json()
+            assert json_response['status'] == 'UP'
+
+        with allure.step('json schema is validated'):
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/appointments_health_schema.json') is None
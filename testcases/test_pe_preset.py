@@ -1,12 +1,15 @@
 import requests
-import json
 import pytest
 from pages.transcript_api_page import TranscriptApiPage
 from pages.appointment_api_page import AppointmentsApiPage
 from pages.authorization_api_page import AuthorizationApiPage
 from pages.ehr_upload_api_page import EHRUploadApiPage
 from testcases.base_test import BaseTest
+from utils.note_pool import NotePool
+from utils.schema_registry import SchemaRegistry
 from utils.helper import get_formatted_date_str, compare_date_str
+from utils.golden_files import thaw
+from utils.json_similarity import assert_json_similar
 from utils.request_handler import RequestHandler
 import jwt
 import allure
@@ -15,10 +18,8 @@ import re
 from utils.dbConfig import DB
 from resources.data import Data
 from utils.api_request_data_handler import APIRequestDataHandler
-from jsonschema.validators import validate
 from utils.upload_go_audio.upload_audio import upload_audio_to_go_note
 import time
-import jsondiff
 
 
 class TestPEPreset(BaseTest):
@@ -63,11 +64,9 @@ class TestPEPreset(BaseTest):
         Test creating and authorizing a non-EHR appointment.
         """
         # Create and authorize an appointment, and retrieve necessary data
-        self.response_data, self.token, self.headers, self.note_id = self.appointments_page.create_and_authorize_a_non_ehr_appointment(
-            user_name=self.user_name,
-            password=self.password,
-            doctor_id=self.doctor_id
-        )
+        self.token = RequestHandler.get_auth_token(user_name=self.user_name, password=self.password)
+        self.response_data, self.headers, self.note_id, *_ = NotePool.lease(user_name=self.user_name,
+                                                                             password=self.password)
 
         # Store the note ID and token for later use
         TestPEPreset.noteId = self.note_id
@@ -78,7 +77,7 @@ class TestPEPreset(BaseTest):
 
     @allure.severity(allure.severity_level.BLOCKER)
     @pytest.mark.sanity
-    def test_get_assigned_pe_preset_of_an_doctor(self):
+    def test_get_assigned_pe_preset_of_an_doctor(self, golden_files):
         response = RequestHandler.get_api_response(base_url=self.pe_preset_base_url,
                                                    user_name=self.user_name,
                                                    password=self.password,
@@ -87,13 +86,10 @@ class TestPEPreset(BaseTest):
             assert response.status_code == 200
             assert response.reason == 'OK'
             json_response = response.json()
-        with open('resources/json_data/pe_preset_response.json', 'r') as json_file:
-            expected_response = json.loads(json_file.read())
-            assert json_response == expected_response
-        with open('resources/json_data/pe_preset_schema.json', 'r') as json_file:
-            expected_schema = json.loads(json_file.read())
+        expected_response = golden_files.load('resources/json_data/pe_preset_response.json')
+        assert json_response == expected_response
         with allure.step('json schema is validated'):
-            assert validate(json_response, expected_schema) is None
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/pe_preset_schema.json') is None
 
 
     @allure.severity(allure.severity_level.BLOCKER)
@@ -261,22 +257,14 @@ class TestPEPreset(BaseTest):
             json_response = response.json()
 
         # Compare the actual and expected JSON responses
-        with open('resources/json_data/apply_pe_preset_response.json', 'r') as json_file:
-            expected_response = json.loads(json_file.read())
-            for item in expected_response:
-                item["input"]["query"] = item["input"]["query"].replace("noteId: \"64dc422e-d388-446d-a565-19e3bff555c2\"", f"noteId: \"{self.note_id}\"")
-            json_response_sorted = sorted(json.dumps(json_response, sort_keys=True)) 
-            expected_response = sorted(json.dumps(expected_response, sort_keys=True))
-            # Calculate the percentage similarity
-            similarity = jsondiff.similarity(json_response_sorted, expected_response)
-            assert similarity >= 0.9, "JSON files are not at least 90% similar"
+        expected_response = thaw(golden_files.load('resources/json_data/apply_pe_preset_response.json'))
+        for item in expected_response:
+            item["input"]["query"] = item["input"]["query"].replace("noteId: \"64dc422e-d388-446d-a565-19e3bff555c2\"", f"noteId: \"{self.note_id}\"")
+        assert_json_similar(expected_response, json_response, threshold=0.9)
 
         # Validate JSON schema of the response
-        with open('resources/json_data/apply_pe_preset_schema.json', 'r') as json_file:
-            expected_schema = json.loads(json_file.read())
-            
         with allure.step('json schema is validated'):
-            assert validate(json_response, expected_schema) is None
+            assert SchemaRegistry.validate(json_response, 'resources/json_data/apply_pe_preset_schema.json') is None
 
 
 
@@ -6,6 +6,7 @@ import os
 from utils.helper import validate_response_schema
 from pages.recording_process_page import RecordingProcessPage
 from testcases.base_test import BaseTest
+from utils.note_pool import NotePool
 from utils.request_handler import RequestHandler
 from pages.appointments_api_page import AppointmentsApiPage
 
@@ -32,7 +33,7 @@ class TestRecordingProcess(BaseTest):
             self.start_time_str,
             self.visit_end_time,
             self.response_body,
-        ) = self.appointment_page.create_ambient_appointment(auth_token=self.token)
+        ) = NotePool.lease(auth_token=self.token)
         
         # Get provider UID and construct recordingId
         self.provider_id = self.appointment_page.get_provider_Id(self.token)
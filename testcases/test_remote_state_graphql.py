@@ -10,13 +10,17 @@ from resources.data import Data
 from testcases.base_test import BaseTest
 from utils.api_request_data_handler import APIRequestDataHandler
 from utils.dbConfig import DB
+from utils.golden_files import element_variations_by_complaint
 from utils.helper import get_formatted_date_str
+from utils.json_similarity import assert_json_similar
 from utils.request_handler import RequestHandler
 import jwt
 import allure
-import jsondiff
 import time
 import os
+from collections import Counter
+
+COMPLAINTS_SELECTION_FILE = 'resources/json_data/complaints_selection.json'
 
 
 class TestRemoteStateGraphQL(BaseTest):
@@ -46,21 +50,22 @@ class TestRemoteStateGraphQL(BaseTest):
     
     @allure.severity(allure.severity_level.BLOCKER)
     @pytest.mark.sanity
-    def test_get_all_complaints_selections_with_lynx_enabled_user_token(self):
+    def test_get_all_complaints_selections_with_lynx_enabled_user_token(self, golden_files):
         # Post a remote state graphql
         response = RequestHandler.get_api_response(base_url=self.remote_state_base_url, request_path=self.note_id,
                                                 request_type='POST', payload=self.payload, headers=self.headers)
-        with open('resources/json_data/complaints_selection.json', 'r') as json_file:
-            expected_response = json.loads(json_file.read())
+        expected_response = golden_files.load(COMPLAINTS_SELECTION_FILE)
         with allure.step('Proper status_code, status_message and reason should be returned for valid user'):
             assert response.status_code == 200
             assert response.reason == "OK"
             json_response = response.json()
-            json_response_sorted = sorted(json.dumps(json_response, sort_keys=True)) 
-            expected_response = sorted(json.dumps(expected_response, sort_keys=True))
-            # Calculate the percentage similarity
-            similarity = jsondiff.similarity(json_response_sorted, expected_response)
-            assert similarity >= 0.9, "JSON files are not at least 90% similar"
+            assert_json_similar(expected_response, json_response, threshold=0.9)
+        with allure.step('Every selected complaint & its descriptor selections should be the expected ones'):
+            expected_complaints = golden_files.index(COMPLAINTS_SELECTION_FILE, 'complaints_by_id')
+            expected_variations = golden_files.index(COMPLAINTS_SELECTION_FILE, 'element_variations_by_complaint')
+            for complaint_id, variation_ids in element_variations_by_complaint(json_response).items():
+                assert complaint_id in expected_complaints, f'Unexpected complaint {complaint_id}'
+                assert Counter(variation_ids) == Counter(expected_variations[complaint_id])
 
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.sanity
@@ -135,7 +140,7 @@ class TestRemoteStateGraphQL(BaseTest):
 
     @allure.severity(allure.severity_level.NORMAL)
     @pytest.mark.regression
-    def test_large_volume_requests(self):
+    def test_large_volume_requests(self, golden_files):
         # Set the maximum response time in seconds
         max_response_time = 5
 
@@ -149,17 +154,12 @@ class TestRemoteStateGraphQL(BaseTest):
             end_time = time.time()
         with allure.step('Verify that the response time is within the acceptable range'):
             assert end_time - start_time < max_response_time, "Response time is too long!"
-        with open('resources/json_data/complaints_selection.json', 'r') as json_file:
-            expected_response = json.loads(json_file.read())
+        expected_response = golden_files.load(COMPLAINTS_SELECTION_FILE)
         with allure.step('Proper create status_code, status_message and reason should be returned for invalid note id in url'):
             assert response.status_code == 200
             assert response.reason == "OK"
             json_response = response.json()
-            json_response_sorted = sorted(json.dumps(json_response, sort_keys=True)) 
-            expected_response = sorted(json.dumps(expected_response, sort_keys=True))
-            # Calculate the percentage similarity
-            similarity = jsondiff.similarity(json_response_sorted, expected_response)
-            assert similarity >= 0.8, "JSON files are not at least 80% similar"
+            assert_json_similar(expected_response, json_response, threshold=0.8)
     
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.security
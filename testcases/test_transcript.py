@@ -7,6 +7,7 @@ import allure
 from pages.transcript_api_page import TranscriptApiPage
 from pages.appointments_api_page import AppointmentsApiPage
 from testcases.base_test import BaseTest
+from utils.note_pool import NotePool
 from utils.helper import validate_response_schema
 import time
 
@@ -40,7 +41,7 @@ class TestTranscript(BaseTest):
             self.start_time_str,
             self.visit_end_time,
             self.response_body,
-        ) = self.appointments_page.create_ambient_appointment(auth_token=self.token)
+        ) = NotePool.lease(auth_token=self.token)
 
         # Print headers and token for debugging
         print(f"Headers: {self.headers}")
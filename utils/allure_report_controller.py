@@ -15,4 +15,6 @@ def modify_report_title(allure_report_path, title):
         json.dump(summary_object, summary_file, indent=4)
         summary_file.truncate()
 
-modify_report_title('D:/DevWorkspace/ScribePortalAutomation/allure-report', 'Sanity Suite Report')
\ No newline at end of file
+
+if __name__ == '__main__':
+    modify_report_title('D:/DevWorkspace/ScribePortalAutomation/allure-report', 'Sanity Suite Report')
\ No newline at end of file
@@ -1,5 +1,6 @@
 import json
 import os
+import threading
 
 from utils.app_constants import AppConstant
 
@@ -8,15 +9,68 @@ class APIRequestDataHandler:
     This class is mainly responsible for loading request data from saved json files. To get the data
     loaded user must initialize the class with the expected json data file's name (excluding extension).
     All the json data files assume to be in the "request_data" folder under "resources" folder.
+
+    Each file is read & parsed only once per process. Every instance gets its own copy of the parsed
+    template, so the in-place modifications done by the get_modified_* methods never leak into the
+    shared template or into other instances.
     """
 
-    def __init__(self, datatype='') -> None:
-        with open(os.path.join(AppConstant.REQUEST_DATA_FOLDER, f'{datatype}.json'), 'r', encoding='UTF-8') as json_file:
-            request_data = json.loads(json_file.read())
+    _templates = {}
+    _lock = threading.Lock()
 
-        self.request_data = request_data
+    def __init__(self, datatype='') -> None:
+        self.request_data = self.copy_json(self.get_template(datatype))
         self.datatype = datatype
 
+    @classmethod
+    def get_template(cls, datatype):
+        """
+        Returns the parsed json data file shared by all the instances. Must not be modified, use an
+        instance of this class to get a private copy instead.
+
+        Args:
+            datatype (str): json data file's name (excluding extension).
+
+        Returns:
+            json_object: parsed content of the json data file.
+        """
+        template = cls._templates.get(datatype)
+        if template is None:
+            with cls._lock:
+                template = cls._templates.get(datatype)
+                if template is None:
+                    with open(os.path.join(AppConstant.REQUEST_DATA_FOLDER, f'{datatype}.json'), 'r',
+                              encoding='UTF-8') as json_file:
+                        template = json.loads(json_file.read())
+                    cls._templates[datatype] = template
+        return template
+
+    @classmethod
+    def clear_templates(cls):
+        """
+        Forget every parsed json data file so that the next instantiation reads it from disk again.
+        """
+        with cls._lock:
+            cls._templates.clear()
+
+    @staticmethod
+    def copy_json(json_object):
+        """
+        Deep copy a parsed json object. Considerably cheaper than copy.deepcopy as only the json types
+        (dict, list & immutable scalars) need to be handled.
+
+        Args:
+            json_object (json): parsed json object to be copied.
+
+        Returns:
+            json_object: independent copy of the json_object.
+        """
+        if isinstance(json_object, dict):
+            return {key: APIRequestDataHandler.copy_json(value) for key, value in json_object.items()}
+        if isinstance(json_object, list):
+            return [APIRequestDataHandler.copy_json(value) for value in json_object]
+        return json_object
+
     def get_payload(self, name='payload'):
         """
         Returns the payload as json object.
@@ -13,5 +13,8 @@ class AppConstant:
     PRODUCTION_CONFIG = join(RESOURCE_FOLDER, 'production.properties')
     DATA_CONFIG = join(RESOURCE_FOLDER, 'data.properties')
     REQUEST_DATA_FOLDER = join(RESOURCE_FOLDER, 'request_data')
+    JSON_DATA_FOLDER = join(RESOURCE_FOLDER, 'json_data')
+    CASSETTE_FOLDER = join(RESOURCE_FOLDER, 'cassettes')
+    TEST_DURATIONS_FILE = join(RESOURCE_FOLDER, 'test_durations.json')
     SKIPPED_TESTCASES_FILE = join(RESOURCE_FOLDER, 'skipped_testcases.properties')
 
@@ -0,0 +1,102 @@
+"""
+Statistical benchmark mode of the suite ('--repeat' & '--repeat-warmup' options). Every collected test is
+run warmup + repeat times; the wall time of each measured iteration and the part of it spent in network
+requests (the total time of the requests recorded by LatencyRecorder during the call) are collected per test
+and summarized in a machine readable report, so that two builds can be compared for regressions.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+from utils.latency_recorder import LatencyRecorder
+from utils.latency_stats import summarize
+
+WARMUP_ID = 'warmup'
+ITERATION_ID = 'repeat'
+
+
+class Benchmark:
+
+    results = defaultdict(list)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def iteration_ids(repeat, warmup=0):
+        """
+        Parametrization ids of the iterations of a test, e.g. ['warmup1', 'repeat1', 'repeat2'].
+        """
+        return [f'{WARMUP_ID}{index}' for index in range(1, warmup + 1)] + \
+               [f'{ITERATION_ID}{index}' for index in range(1, repeat + 1)]
+
+    @staticmethod
+    def test_key(item):
+        """
+        Node ID of the test without the benchmark iteration id, so that all iterations of a test (including
+        the ones of its own parametrizations) are grouped together.
+        """
+        name, _, param_id = item.nodeid.partition('[')
+        params = [param for param in param_id.rstrip(']').split('-')
+                  if param and not param.startswith((WARMUP_ID, ITERATION_ID))]
+        return f"{name}[{'-'.join(params)}]" if params else name
+
+    @staticmethod
+    def start():
+        """
+        Start timing an iteration.
+        :return: Value to pass to stop()
+        """
+        return LatencyRecorder.mark(), time.perf_counter()
+
+    @classmethod
+    def stop(cls, item, iteration_id, started, passed):
+        """
+        Record the wall & network time of an iteration, unless it is a warmup one.
+        :param item: pytest item
+        :param iteration_id: Benchmark iteration id of the item
+        :param started: Value returned by start()
+        :param passed: Whether the iteration passed
+        """
+        position, start = started
+        wall_time = time.perf_counter() - start
+        network_time = sum(sample['total'] for sample in LatencyRecorder.samples_since(position))
+        cls.record(cls.test_key(item), iteration_id, wall_time, network_time, passed)
+
+    @classmethod
+    def record(cls, test_key, iteration_id, wall_time, network_time, passed):
+        if iteration_id.startswith(WARMUP_ID):
+            return
+        with cls._lock:
+            cls.results[test_key].append({'wall': wall_time, 'network': network_time, 'passed': passed})
+
+    @classmethod
+    def report(cls):
+        """
+        Per test count, failures & summary (mean, stddev, min, max, percentiles in ms) of the wall time, the
+        network time & the remaining (client side) time of the measured iterations.
+        """
+        report = {}
+        for test_key in sorted(cls.results):
+            iterations = cls.results[test_key]
+            report[test_key] = {
+                'iterations': len(iterations),
+                'failures': sum(1 for iteration in iterations if not iteration['passed']),
+            }
+            # Requests sent concurrently may add up to more network than wall time, hence the client time floor.
+            for name, values in (('wall_ms', [iteration['wall'] for iteration in iterations]),
+                                 ('network_ms', [iteration['network'] for iteration in iterations]),
+                                 ('client_ms', [max(iteration['wall'] - iteration['network'], 0)
+                                                for iteration in iterations])):
+                report[test_key][name] = {key: round(value * 1000, 3)
+                                          for key, value in summarize(values).items() if key != 'count'}
+        return report
+
+    @classmethod
+    def save_report(cls, path):
+        report = cls.report()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='UTF-8') as report_file:
+            json.dump(report, report_file, indent=4)
+        return report
+
@@ -0,0 +1,238 @@
+"""
+Record/replay HTTP cassettes. In 'record' mode every request sent through SessionManager is performed for
+real and stored (secrets masked) together with its response & timing; in 'replay' mode the stored responses
+are served back without touching the network. Cassettes are gzip compressed JSON lines files; in parallel
+runs every xdist worker records its own '<name>_<worker>.jsonl.gz' file, and a replay loads all of them.
+"""
+import base64
+import datetime
+import glob
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from utils.endpoint_template import to_endpoint_template
+
+MASK = '***'
+SECRET_HEADERS = ('authorization', 'cookie', 'set-cookie', 'x-api-key', 'proxy-authorization')
+SECRET_BODY_FIELDS = ('password', 'passwd', 'secret')
+# JWTs keep their (decodable) header & claims, only the signature is replaced.
+JWT = re.compile(r'^(eyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+)\.[A-Za-z0-9_-]+$')
+MASKED_JWT_SIGNATURE = 'bWFza2Vk'
+
+
+class CassetteMissError(Exception):
+    """
+    Raised in replay mode when the cassette holds no interaction for a request.
+    """
+
+
+class Cassette:
+
+    RECORD = 'record'
+    REPLAY = 'replay'
+
+    def __init__(self, path, mode):
+        """
+        :param path: Cassette file path (gzip compressed JSON lines)
+        :param mode: 'record' or 'replay'
+        """
+        if mode not in (self.RECORD, self.REPLAY):
+            raise ValueError(f'Invalid cassette mode: {mode}. Please provide either record or replay.')
+
+        self.path = path
+        self.mode = mode
+        self.interactions = []
+        self._by_url = defaultdict(list)
+        self._by_template = defaultdict(list)
+        self._cursors = {}
+        self._used = set()
+        self._lock = threading.Lock()
+
+        if mode == self.REPLAY:
+            self.load()
+
+    def request(self, session, method, url, **kwargs):
+        """
+        Send (record mode) or replay (replay mode) a request.
+        :param session: requests.Session used to perform the request in record mode
+        :param method: HTTP method
+        :param url: Request URL
+        :param kwargs: Keyword arguments of requests.Session.request
+        :return: requests.Response
+        """
+        if self.mode == self.REPLAY:
+            return self.replay(method, url)
+
+        start = time.perf_counter()
+        response = session.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - start
+        self.record(method, url, kwargs.get('headers'), kwargs.get('data'), response, elapsed)
+        return response
+
+    def record(self, method, url, request_headers, request_body, response, elapsed):
+        interaction = {
+            'method': method.upper(),
+            'url': url,
+            'request_headers': self.mask_headers(request_headers),
+            'request_body': self.mask_body(request_body),
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': self.mask_headers(response.headers),
+            'elapsed': elapsed,
+        }
+        interaction.update(self.encode_body(self.mask_content(response.content)))
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def replay(self, method, url):
+        """
+        Return the next unused interaction recorded for the same method & URL, or - as ids generated during
+        the run differ from the recorded ones - for the same method & endpoint template. Once all of them
+        are used up, the last one is served again.
+        """
+        method = method.upper()
+        with self._lock:
+            index = self._take('url', self._by_url, (method, url))
+            if index is None:
+                index = self._take('template', self._by_template, (method, to_endpoint_template(url)))
+            if index is None:
+                raise CassetteMissError(f'No recorded interaction for {method} {url} in {self.path}')
+            self._used.add(index)
+
+        return self.build_response(self.interactions[index], url)
+
+    def load(self):
+        """
+        Read the cassette file and the files recorded by the xdist workers next to it.
+        """
+        root, extension = self.split_extension(self.path)
+        paths = [path for path in [self.path] + sorted(glob.glob(f'{glob.escape(root)}_gw*{extension}'))
+                 if os.path.exists(path)]
+        if not paths:
+            raise FileNotFoundError(f'No cassette found at {self.path}')
+        for path in paths:
+            with gzip.open(path, 'rt', encoding='UTF-8') as cassette_file:
+                self.interactions.extend(json.loads(line) for line in cassette_file if line.strip())
+
+        for index, interaction in enumerate(self.interactions):
+            self._by_url[(interaction['method'], interaction['url'])].append(index)
+            self._by_template[(interaction['method'], to_endpoint_template(interaction['url']))].append(index)
+
+    def save(self):
+        """
+        Write the recorded interactions to the cassette file, suffixed with the xdist worker id (e.g.
+        local_gw0.jsonl.gz) when running in parallel. Nothing is written in replay mode.
+        """
+        if self.mode != self.RECORD:
+            return
+
+        path = self.path
+        worker = os.environ.get('PYTEST_XDIST_WORKER')
+        if worker:
+            root, extension = self.split_extension(path)
+            path = f'{root}_{worker}{extension}'
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock, gzip.open(path, 'wt', encoding='UTF-8') as cassette_file:
+            for interaction in self.interactions:
+                cassette_file.write(json.dumps(interaction, separators=(',', ':')) + '\n')
+        print(f'{len(self.interactions)} HTTP interaction(s) recorded to {path}')
+
+    def _take(self, table_name, table, key):
+        indexes = table.get(key)
+        if not indexes:
+            return None
+
+        position = self._cursors.get((table_name, key), 0)
+        while position < len(indexes) and indexes[position] in self._used:
+            position += 1
+        self._cursors[(table_name, key)] = position
+        return indexes[position] if position < len(indexes) else indexes[-1]
+
+    @staticmethod
+    def split_extension(path):
+        """
+        Split the compound extension of a cassette, e.g. local.jsonl.gz -> ('local', '.jsonl.gz').
+        """
+        root, extension = os.path.splitext(path)
+        if extension == '.gz':
+            root, inner_extension = os.path.splitext(root)
+            extension = inner_extension + extension
+        return root, extension
+
+    @staticmethod
+    def build_response(interaction, url):
+        response = requests.Response()
+        response.status_code = interaction['status_code']
+        response.reason = interaction['reason']
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        response.url = url
+        response.encoding = 'utf-8'
+        response.elapsed = datetime.timedelta(seconds=interaction['elapsed'])
+        if interaction['body_encoding'] == 'base64':
+            response._content = base64.b64decode(interaction['body'])
+        else:
+            response._content = interaction['body'].encode('utf-8')
+        return response
+
+    @staticmethod
+    def encode_body(content):
+        try:
+            return {'body': content.decode('utf-8'), 'body_encoding': 'utf-8'}
+        except UnicodeDecodeError:
+            return {'body': base64.b64encode(content).decode('ascii'), 'body_encoding': 'base64'}
+
+    @staticmethod
+    def mask_headers(headers):
+        if not headers:
+            return {}
+        return {key: MASK if key.lower() in SECRET_HEADERS else value for key, value in headers.items()}
+
+    @classmethod
+    def mask_body(cls, body):
+        if body is None:
+            return None
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', errors='replace')
+        try:
+            json_body = json.loads(body)
+        except (TypeError, ValueError):
+            return str(body)
+        return json.dumps(cls.mask_json(json_body), separators=(',', ':'))
+
+    @classmethod
+    def mask_content(cls, content):
+        """
+        Mask the secrets of a JSON response body, e.g. the token returned by the authentication endpoint.
+        Other bodies are returned unchanged.
+        """
+        try:
+            json_body = json.loads(content)
+        except (TypeError, ValueError):
+            return content
+        return json.dumps(cls.mask_json(json_body), separators=(',', ':')).encode('utf-8')
+
+    @classmethod
+    def mask_json(cls, value, key=''):
+        """
+        Recursively mask the secret fields (SECRET_BODY_FIELDS & '*token*' keys) and the JWT signatures.
+        """
+        if isinstance(value, dict):
+            return {child_key: cls.mask_json(child, str(child_key)) for child_key, child in value.items()}
+        if isinstance(value, list):
+            return [cls.mask_json(child, key) for child in value]
+        if not isinstance(value, str):
+            return value
+        jwt_match = JWT.match(value)
+        if jwt_match:
+            return f'{jwt_match.group(1)}.{MASKED_JWT_SIGNATURE}'
+        if key.lower() in SECRET_BODY_FIELDS or 'token' in key.lower():
+            return MASK
+        return value
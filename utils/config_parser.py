@@ -1,5 +1,4 @@
-from io import StringIO
-
+import pytest
 from jproperties import Properties
 
 from utils.app_constants import AppConstant
@@ -10,6 +9,9 @@ class ConfigParser:
     def __init__(self):
         self.configs = Properties()
         self.files = []
+        # Bumped on every change, so that the values cached by Config are read again.
+        self.version = 0
+        self.secrets = None
 
     def add_file(self, file_name):
         self.files.append(file_name)
@@ -34,35 +36,86 @@ class ConfigParser:
         try:
             with open(config_path, 'rb') as config_file:
                 self.configs.load(config_file)
+            self.version += 1
         except FileNotFoundError:
             print(f'Sorry, the file {config_path} does not exists.')
 
+    def add_secrets(self, secrets):
+        """
+        Serve the configs of a SecretStore, decrypted on first read, over the values of the loaded files.
+        :param secrets: SecretStore
+        """
+        self.secrets = secrets
+        self.version += 1
+
+    def keys(self):
+        """
+        Keys of the loaded configs and of the (not yet decrypted) secrets.
+        """
+        keys = list(self.configs)
+        if self.secrets is not None:
+            keys += [key for key in self.secrets.keys() if key not in self.configs]
+        return keys
+
     def get_config(self, key):
+        if self.secrets is not None and key in self.secrets:
+            return self.secrets.get(key).strip()
         value = self.configs.get(key)
         return None if value is None else value.data.strip()
 
     def set_config(self, key, value):
+        if self.secrets is not None:
+            # An explicitly set value overrides the secret.
+            self.secrets.discard(key)
         self.configs[key] = value
+        self.version += 1
 
     def delete_config(self, key):
         del self.configs[key]
+        self.version += 1
 
     def update_config(self, key, value, config_path=AppConstant.DEV_CONFIG):
 
         with open(config_path, 'wb') as config_file:
             self.configs[key] = value
+            self.version += 1
             self.configs.store(config_file, encoding="utf-8",
                                strip_meta=False, timestamp=False)
 
 
-conf = ConfigParser()
-conf.add_file(AppConstant.DEV_CONFIG)
-conf.load_configs()
-
-count = -1
-
-for i in conf.configs:
-    if i.startswith('username'):
-        count = count + 1
 
-print(count)
+class Config:
+    """
+    Lazily resolved config value of the session's loaded configs (pytest.configs), for class attributes that
+    used to be read at import time, e.g. `base_url = Config('ehr_base_url')`. The value is only read on first
+    access and cached until the configs change, so modules can be imported before the pytest session is
+    configured (or outside pytest).
+    """
+
+    def __init__(self, key):
+        """
+        :param key: Config key, e.g. 'provider_base_url'
+        """
+        self.key = key
+        self._cached = None
+
+    def __get__(self, instance, owner=None):
+        configs = self.loaded_configs()
+        cached = self._cached
+        if cached is None or cached[0] is not configs or cached[1] != configs.version:
+            cached = self._cached = (configs, configs.version, configs.get_config(self.key))
+        return cached[2]
+
+    @staticmethod
+    def get(key):
+        """
+        Read a config value at call time, e.g. for a default argument left as None.
+        """
+        return Config.loaded_configs().get_config(key)
+
+    @staticmethod
+    def loaded_configs():
+        configs = getattr(pytest, 'configs', None)
+        if configs is None:
+            raise RuntimeError('The configs are not loaded yet: they are loaded by pytest_configure (conftest.py).')
+        return configs
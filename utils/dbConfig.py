@@ -4,20 +4,20 @@ import paramiko
 # import pandas as pd
 from paramiko import SSHClient
 from sshtunnel import SSHTunnelForwarder
+from utils.db_pool import DBConnectionPool
 from os.path import expanduser
 import pytest
 from pathlib import Path
 from io import StringIO
 
 
-ENV = pytest.env
-
 class DB:
     def execute_query(self, sql_query=''):
-        if ENV in ('stage', 'staging', 'demo'):
-            if ENV in ('stage', 'staging'):
+        env = pytest.env
+        if env in ('stage', 'staging', 'demo'):
+            if env in ('stage', 'staging'):
                 sql_hostname = pytest.configs.get_config('stage_db_host')
-            if ENV in ('demo'):
+            if env in ('demo'):
                 sql_hostname = pytest.configs.get_config('demo_db_host')
             sql_username = pytest.configs.get_config('stage_db_username')
             sql_password = pytest.configs.get_config('stage_db_password')
@@ -33,26 +33,13 @@ class DB:
 
 
 
-            with SSHTunnelForwarder(
-                    (ssh_host, ssh_port),
-                    ssh_username=ssh_user,
-                    ssh_pkey=self.ssh_pkey,
-                    remote_bind_address=(sql_hostname, sql_port)) as tunnel:
-
-                    conn = pymysql.connect(host='127.0.0.1', user=sql_username,
-                            passwd=sql_password, db=sql_main_database,
-                            port=tunnel.local_bind_port)
+            tunnel = DBConnectionPool.get_tunnel(ssh_host, ssh_user, self.ssh_pkey, sql_hostname, sql_port, ssh_port)
+            pool = DBConnectionPool.get_pool(host='127.0.0.1', user=sql_username, passwd=sql_password,
+                                             db=sql_main_database, port=tunnel.local_bind_port)
+            print('sql_query: ', sql_query)
+            return pool.execute(sql_query, commit=True)
 
-                    cursor = conn.cursor()
-                    print('sql_query: ', sql_query)
-                    cursor.execute(sql_query)
-                    conn.commit()
-                    results = cursor.fetchall()
-                    print(cursor.fetchone())
-                    conn.close()
-                    return results
-                    
-        elif ENV == 'dev':
+        elif env == 'dev':
             dev_cred = {
                 'host': pytest.configs.get_config('dev_db_host'),
                 'database': pytest.configs.get_config('dev_db_database'),
@@ -60,13 +47,6 @@ class DB:
                 'password': pytest.configs.get_config('dev_db_password'),
             }
 
-            conn = pymysql.connect(**dev_cred)
-
-            cursor = conn.cursor()
+            pool = DBConnectionPool.get_pool(**dev_cred)
             print('sql_query: ', sql_query)
-            cursor.execute(sql_query)
-            conn.commit()
-            results = cursor.fetchall()
-            print(cursor.fetchone())
-            conn.close()
-            return results
+            return pool.execute(sql_query, commit=True)
@@ -10,6 +10,8 @@ import pymysql
 import pytest
 from sshtunnel import SSHTunnelForwarder
 
+from utils.db_pool import DBConnectionPool
+
 
 # pylint: disable=too-many-instance-attributes
 class DBManager:
@@ -38,50 +40,56 @@ class DBManager:
         self.server = None
 
     def get_db_connection(self, db_name=None):
+        """
+        Check a pooled connection of the selected DB out. To be used as a context manager, the connection
+        goes back to the pool at the end of the with-block.
+        """
+        return self.get_connection_pool(db_name).connection()
+
+    def get_connection_pool(self, db_name=None):
+        """
+        Return the session-wide connection pool of the selected DB.
+        """
         if db_name is None:
             db_name = pytest.configs.get_config('db_name')
         if pytest.env == 'dev':
-            db_connection = pymysql.connect(
+            return DBConnectionPool.get_pool(
                 host=self.db_host,
                 user=self.db_user,
                 passwd=self.db_password,
                 db=db_name,
                 port=3306,
                 cursorclass=pymysql.cursors.DictCursor)
-            return db_connection
         if pytest.env in ('stage', 'staging'):
-            db_connection = pymysql.connect(
+            if self.server is None:
+                self.start_tunnel()
+            return DBConnectionPool.get_pool(
                 host='127.0.0.1',
                 user=self.db_user,
                 passwd=self.db_password,
                 db=db_name,
                 port=self.server.local_bind_port,
                 cursorclass=pymysql.cursors.DictCursor)
-            return db_connection
 
         print('Live DB connection is not supported.')
         return None
 
     def start_tunnel(self):
+        """
+        Attach to the session-wide tunnel of the environment, it is opened only on the first call.
+        """
         if pytest.env in ('stage', 'staging'):
-            server = SSHTunnelForwarder(
-                self.ssh_host,
-                ssh_username=self.ssh_user,
-                ssh_pkey=self.ssh_pkey,
-                remote_bind_address=(self.db_host, 3306),
-                local_bind_address=('localhost', 33006)
-            )
-
-            self.server = server
-            self.server.start()
-            print(f'Tunnelling started at {server.local_bind_port}.')
+            self.server = DBConnectionPool.get_tunnel(self.ssh_host, self.ssh_user, self.ssh_pkey, self.db_host,
+                                                      3306, self.ssh_port, local_bind_address=('localhost', 33006))
         elif pytest.env in ('prod', 'live'):
             print('Live db connection is not supported yet.')
 
     def stop_tunnel(self):
-        if self.server:
-            self.server.stop()
-            print('Tunnelling stopped...')
+        """
+        Detach from the shared tunnel. The tunnel itself stays open for the other suites and is stopped
+        together with the pooled connections at the end of the session.
+        """
+        self.server = None
 
     def get_row(self, db_cursor, sql_query):
         db_cursor.execute(sql_query)
@@ -97,15 +105,8 @@ class DBManager:
         :param fetch_one - fetch only single row by default.
         :param commit - whether to commit the executed query
         """
-        db_connection = self.get_db_connection()
-        db_cursor = db_connection.cursor()
-        db_cursor.execute(query_string)
-        if commit:
-            db_connection.commit()
-            return None
-        if fetch_one:
-            return db_cursor.fetchone()
-        return db_cursor.fetchall()
+        rows = self.get_connection_pool().execute(query_string, fetch_one=fetch_one, commit=commit)
+        return None if commit else rows
 
 
 class TestDB:
@@ -0,0 +1,165 @@
+"""
+Session-scoped DB access layer: one SSH tunnel per environment and a bounded pool of health-checked MySQL
+connections per database, shared by DB & DBManager instead of opening a tunnel/connection for every query.
+"""
+# pylint: disable=no-member
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+import pytest
+from sshtunnel import SSHTunnelForwarder
+
+
+class DBConnectionPool:
+    """
+    Bounded pool of pymysql connections. Connections are created lazily up to 'max_size', handed out with
+    'connection()' and returned to the pool afterwards. An idle connection is pinged (and transparently
+    reconnected) before being reused if it has been idle longer than 'health_check_interval' seconds.
+    """
+
+    DEFAULT_POOL_SIZE = 5
+    DEFAULT_HEALTH_CHECK_INTERVAL = 30
+    CHECKOUT_TIMEOUT = 60
+
+    _pools = {}
+    _tunnels = {}
+    _lock = threading.Lock()
+
+    def __init__(self, max_size=DEFAULT_POOL_SIZE, health_check_interval=DEFAULT_HEALTH_CHECK_INTERVAL,
+                 **connect_kwargs):
+        self.max_size = max_size
+        self.health_check_interval = health_check_interval
+        self.connect_kwargs = connect_kwargs
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    @classmethod
+    def get_pool(cls, **connect_kwargs):
+        """
+        Return the shared pool for the given pymysql connection arguments, creating it on first use.
+        :param connect_kwargs: Keyword arguments passed to pymysql.connect
+        """
+        key = tuple(sorted((name, str(value)) for name, value in connect_kwargs.items()))
+        with cls._lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls(max_size=cls._get_int_config('db_pool_size', cls.DEFAULT_POOL_SIZE),
+                           health_check_interval=cls._get_int_config('db_pool_health_check_interval',
+                                                                     cls.DEFAULT_HEALTH_CHECK_INTERVAL),
+                           **connect_kwargs)
+                cls._pools[key] = pool
+        return pool
+
+    @classmethod
+    def get_tunnel(cls, ssh_host, ssh_user, ssh_pkey, remote_host, remote_port=3306, ssh_port=22,
+                   local_bind_address=None):
+        """
+        Return the started SSH tunnel to remote_host:remote_port, opening it only once per session.
+        :return: Started SSHTunnelForwarder
+        """
+        key = (ssh_host, ssh_port, ssh_user, remote_host, remote_port)
+        with cls._lock:
+            tunnel = cls._tunnels.get(key)
+            if tunnel is None or not tunnel.is_active:
+                tunnel_kwargs = {'ssh_username': ssh_user, 'ssh_pkey': ssh_pkey,
+                                 'remote_bind_address': (remote_host, remote_port)}
+                if local_bind_address:
+                    tunnel_kwargs['local_bind_address'] = local_bind_address
+                tunnel = SSHTunnelForwarder((ssh_host, ssh_port), **tunnel_kwargs)
+                tunnel.start()
+                print(f'Tunnelling started at {tunnel.local_bind_port}.')
+                cls._tunnels[key] = tunnel
+        return tunnel
+
+    @classmethod
+    def close_all(cls):
+        """
+        Close every pooled connection and stop every tunnel. Called once the whole run is over.
+        """
+        with cls._lock:
+            for pool in cls._pools.values():
+                pool.close()
+            cls._pools.clear()
+            for tunnel in cls._tunnels.values():
+                tunnel.stop()
+                print('Tunnelling stopped...')
+            cls._tunnels.clear()
+
+    @contextmanager
+    def connection(self):
+        """
+        Check a connection out of the pool for the duration of the with-block. Uncommitted work is rolled back
+        when the connection is returned so that the next user does not inherit an open transaction/snapshot.
+        A connection which raised is discarded instead of being returned.
+        """
+        if not self._slots.acquire(timeout=self.CHECKOUT_TIMEOUT):
+            raise TimeoutError(f'No DB connection available within {self.CHECKOUT_TIMEOUT} seconds.')
+
+        db_connection = None
+        try:
+            db_connection = self._checkout()
+            yield db_connection
+            db_connection.rollback()
+            self._idle.put((db_connection, time.monotonic()))
+        except Exception:
+            if db_connection:
+                self._discard(db_connection)
+            raise
+        finally:
+            self._slots.release()
+
+    def execute(self, sql_query, fetch_one=False, commit=False):
+        """
+        Execute a query on a pooled connection.
+        :param sql_query: Query to be executed
+        :param fetch_one: Fetch only a single row instead of all of them
+        :param commit: Whether to commit the executed query
+        :return: Fetched row(s)
+        """
+        with self.connection() as db_connection:
+            with db_connection.cursor() as cursor:
+                cursor.execute(sql_query)
+                if commit:
+                    db_connection.commit()
+                return cursor.fetchone() if fetch_one else cursor.fetchall()
+
+    def close(self):
+        while True:
+            try:
+                db_connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(db_connection)
+
+    def _checkout(self):
+        try:
+            db_connection, idle_since = self._idle.get_nowait()
+        except queue.Empty:
+            return pymysql.connect(**self.connect_kwargs)
+
+        if time.monotonic() - idle_since > self.health_check_interval:
+            try:
+                db_connection.ping(reconnect=True)
+            except pymysql.MySQLError:
+                self._discard(db_connection)
+                return pymysql.connect(**self.connect_kwargs)
+        return db_connection
+
+    @staticmethod
+    def _discard(db_connection):
+        try:
+            db_connection.close()
+        except pymysql.MySQLError:
+            pass
+
+    @staticmethod
+    def _get_int_config(key, default):
+        configs = getattr(pytest, 'configs', None)
+        value = configs.get_config(key) if configs else None
+        try:
+            return int(value) if value else default
+        except ValueError:
+            return default
@@ -0,0 +1,32 @@
+import re
+from urllib.parse import parse_qsl, urlsplit
+
+_ID_SEGMENT = re.compile(
+    r'^(\d+'
+    r'|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+    r'|[\w.+-]+@[\w-]+\.[\w.-]+'
+    r'|(?=[\w-]*\d)[\w-]{16,})$'
+)
+
+
+def to_endpoint_template(url, base_url=None):
+    """
+    Reduce a concrete request URL to its endpoint template by replacing ids (numbers, UUIDs, emails &
+    long id-like tokens) in the path with '{id}' and dropping query parameter values, e.g.
+    'https://host/note/v1/provider/patients/1029761?visitDate=2024-01-01' -> 'note/v1/provider/patients/{id}?visitDate'.
+    :param url: Request URL
+    :param base_url: Base URL stripped from the template if given
+    :return: Endpoint template
+    """
+    if base_url and url.startswith(base_url):
+        url = url[len(base_url):]
+
+    split_url = urlsplit(url)
+    segments = ['{id}' if _ID_SEGMENT.match(segment) else segment
+                for segment in split_url.path.strip('/').split('/')]
+    template = '/'.join(segments)
+
+    query_keys = sorted({key for key, _ in parse_qsl(split_url.query, keep_blank_values=True)})
+    if query_keys:
+        template += '?' + '&'.join(query_keys)
+    return template
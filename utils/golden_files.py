@@ -0,0 +1,165 @@
+import json
+import os
+import threading
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict of a golden file. Still a dict, so it compares & serializes like the parsed JSON.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('Golden file data is read-only, use thaw() to get a mutable copy.')
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return dict, (thaw(self),)
+
+
+class FrozenList(list):
+    """
+    Read-only list of a golden file. Still a list, so it compares & serializes like the parsed JSON.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('Golden file data is read-only, use thaw() to get a mutable copy.')
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return list, (thaw(self),)
+
+
+def freeze(value):
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(child)) for key, child in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(child) for child in value)
+    return value
+
+
+def thaw(value):
+    """
+    Mutable deep copy of golden file data, e.g. to replace placeholders before comparing.
+    """
+    if isinstance(value, dict):
+        return {key: thaw(child) for key, child in value.items()}
+    if isinstance(value, list):
+        return [thaw(child) for child in value]
+    return value
+
+
+def _complaints(document):
+    if isinstance(document, list):
+        return document
+    if 'data' in document:
+        # Remote state GraphQL response, e.g. complaints_selection.json
+        return document['data']['listComplaintsSelection']['items']
+    return [document]
+
+
+def _complaint_id(complaint):
+    return complaint['ComplaintId'] if 'ComplaintId' in complaint else complaint['id']
+
+
+def _element_variation_ids(complaint):
+    if 'descriptorSelections' in complaint:
+        return [selection['ElementVariationId'] for selection in complaint['descriptorSelections']['items']]
+    return [block['elementVariationId'] for blocks in ('hpiBlocks', 'apBlocks')
+            for block in complaint.get(blocks) or []]
+
+
+def complaints_by_id(document):
+    """
+    Complaint ID -> complaint entries, for complaint lists, single complaints & remote state complaint
+    selections (which list a complaint once per note section).
+    """
+    index = {}
+    for complaint in _complaints(document):
+        index.setdefault(_complaint_id(complaint), []).append(complaint)
+    return index
+
+
+def element_variations_by_complaint(document):
+    """
+    Complaint ID -> element variation IDs of its HPI/AP blocks or descriptor selections.
+    """
+    index = {}
+    for complaint in _complaints(document):
+        index.setdefault(_complaint_id(complaint), []).extend(_element_variation_ids(complaint))
+    return index
+
+
+class GoldenFiles:
+    """
+    Process-wide cache of the golden (expected response) files of 'resources/json_data'. Each file is
+    read & parsed once, and handed out as a read-only structure shared by every test, so a test
+    can't change the data seen by the next one. Indexes of the INDEXES builders are built once per file too,
+    e.g. GoldenFiles.index('resources/json_data/complaints_selection.json', 'complaints_by_id')[601].
+    """
+
+    INDEXES = {
+        'complaints_by_id': complaints_by_id,
+        'element_variations_by_complaint': element_variations_by_complaint,
+    }
+
+    _documents = {}
+    _indexes = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """
+        :param path: Path of the JSON file, absolute or relative to the project root
+        :return: Read-only parsed content
+        """
+        key = os.path.abspath(path)
+        document = cls._documents.get(key)
+        if document is None:
+            with cls._lock:
+                document = cls._documents.get(key)
+                if document is None:
+                    document = cls._documents[key] = freeze(cls._parse(key))
+        return document
+
+    @classmethod
+    def index(cls, path, name):
+        """
+        :param path: Path of the JSON file, absolute or relative to the project root
+        :param name: Name of the index, one of INDEXES
+        :return: Read-only index of the file content
+        """
+        key = (os.path.abspath(path), name)
+        index = cls._indexes.get(key)
+        if index is None:
+            document = cls.load(path)
+            with cls._lock:
+                index = cls._indexes.get(key)
+                if index is None:
+                    index = cls._indexes[key] = freeze(cls.INDEXES[name](document))
+        return index
+
+    @staticmethod
+    def _parse(path):
+        with open(path, 'rb') as json_file:
+            content = json_file.read()
+        if not content:
+            raise ValueError(f'Golden file is empty: {path}')
+        return json.loads(content)
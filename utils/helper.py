@@ -1,14 +1,16 @@
 import time
 import json
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 import datetime
 import string
 import random
 import pytz
 from utils.request_handler import RequestHandler
+from utils.schema_registry import SchemaRegistry
+from utils.logger import LazyBody, get_logger
 import jwt
 
+logger = get_logger('helper')
 
 
 def wait_for_next_minute():
@@ -83,21 +85,14 @@ def validate_response_schema(response_json, schema_path):
     :param schema_path: Path to the JSON schema file.
     """
     try:
-        # Load the schema from the file
-        with open(schema_path, "r") as schema_file:
-            schema = json.load(schema_file)
+        # Log the schema and response for debugging (serialized only if DEBUG logging is enabled)
+        logger.debug("Schema loaded from %s: %s", schema_path, LazyBody(SchemaRegistry.get_schema(schema_path)))
+        logger.debug("Response JSON to validate: %s", LazyBody(response_json))
 
-        # Log the schema and response for debugging
-        print(f"Schema loaded from {schema_path}: {json.dumps(schema, indent=4)}")
-        print(f"Response JSON to validate: {json.dumps(response_json, indent=4)}")
-
-        # Validate the response JSON against the schema
-        validate(instance=response_json, schema=schema)
-        print("Response JSON is valid against the schema.")
+        # Validate the response JSON against the compiled schema (parsed only once per process)
+        SchemaRegistry.validate(response_json, schema_path)
+        logger.info("Response JSON is valid against the schema %s.", schema_path)
 
     except ValidationError as e:
-        # Log the validation error and raise an assertion        # Log the validation error and raise an assertion
-        print(f"Validation Error: {e.message}")
-        print(f"Validation Error: {e.message}")
-
-
+        # Log the validation error
+        logger.error("Validation Error: %s", e.message)
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import re
+
+ROOT = '$'
+_TOKEN = re.compile(r"\.\.|\.([^.\[\]]+)|\[(\*|\d+|'[^']*'|\"[^\"]*\")\]")
+
+
+class JsonPath:
+    """
+    The subset of JSONPath used to point at volatile fields: '$' root, '.key' / "['key']" children, '[n]' list
+    items, '*' / '[*]' any child and '..' any depth, e.g. '$..id', '$.data.items[*].createdAt'.
+    """
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.steps = self._parse(expression)
+
+    def matches(self, path):
+        """
+        :param path: Tuple of the keys / indexes from the root to a value
+        """
+        return self._matches(0, path, 0)
+
+    def _matches(self, step_index, path, path_index):
+        if step_index == len(self.steps):
+            return path_index == len(path)
+        step = self.steps[step_index]
+        if step == '..':
+            return any(self._matches(step_index + 1, path, index) for index in range(path_index, len(path) + 1))
+        if path_index == len(path):
+            return False
+        return (step == '*' or step == path[path_index]) and self._matches(step_index + 1, path, path_index + 1)
+
+    @staticmethod
+    def _parse(expression):
+        if not expression.startswith(ROOT):
+            raise ValueError(f"JSONPath should start with '{ROOT}': {expression}")
+        steps, position = [], len(ROOT)
+        while position < len(expression):
+            match = _TOKEN.match(expression, position)
+            if not match:
+                raise ValueError(f'Unsupported JSONPath syntax at {position}: {expression}')
+            key, selector = match.groups()
+            if match.group(0) == '..':
+                steps.append('..')
+                if expression[match.end():match.end() + 1] not in ('', '['):
+                    # '..key': the key follows the descent without its own dot.
+                    position = match.end() - 1
+                    continue
+            elif key is not None:
+                steps.append(key)
+            elif selector == '*' or selector.isdigit():
+                steps.append(int(selector) if selector.isdigit() else '*')
+            else:
+                steps.append(selector[1:-1])
+            position = match.end()
+        return steps
+
+
+def format_path(path):
+    return ROOT + ''.join(f'[{step}]' if isinstance(step, int) else f'.{step}' for step in path)
+
+
+class _Node:
+    """
+    Canonical form of a JSON value: a digest of the value (independent of the key order) and the number of
+    scalar leaves, so that equal subtrees are recognized by a single comparison.
+    """
+    __slots__ = ('value', 'digest', 'size', 'children')
+
+    def __init__(self, value, digest, size, children=None):
+        self.value = value
+        self.digest = digest
+        self.size = size
+        self.children = children
+
+
+class JsonComparison:
+
+    def __init__(self, similarity, differences):
+        """
+        :param similarity: Share of the scalar leaves of both documents that match, from 0 to 1
+        :param differences: List of (JSONPath, expected value, actual value) tuples, None for a missing value
+        """
+        self.similarity = similarity
+        self.differences = differences
+
+    def summary(self, limit=10):
+        lines = [f'similarity: {self.similarity:.2%}, {len(self.differences)} differing path(s)']
+        lines += [f'  {path}: expected {json.dumps(expected, default=str)[:200]}, '
+                  f'got {json.dumps(actual, default=str)[:200]}' for path, expected, actual in self.differences[:limit]]
+        if len(self.differences) > limit:
+            lines.append(f'  ... {len(self.differences) - limit} more')
+        return '\n'.join(lines)
+
+
+class JsonSimilarity:
+    """
+    Structural comparison of parsed JSON documents. Objects are compared key by key regardless of the key
+    order, list items are first paired with an equal item of the other list (in any order) and the rest are
+    compared position by position. The similarity is the share of the scalar leaves that match, and every
+    differing path is reported. Fields matching one of the 'ignore_paths' JSONPaths (e.g. ids, timestamps)
+    are left out of both documents.
+    """
+
+    def __init__(self, ignore_paths=()):
+        """
+        :param ignore_paths: JSONPaths of the volatile fields, e.g. ['$..id', '$..createdAt']
+        """
+        self.ignore_paths = [JsonPath(expression) for expression in ignore_paths]
+
+    def compare(self, expected, actual):
+        """
+        :param expected: Expected (golden) document
+        :param actual: Actual document, e.g. a parsed response
+        :return: JsonComparison
+        """
+        expected_node, actual_node = self._canonicalize(expected, ()), self._canonicalize(actual, ())
+        differences = []
+        matched = self._match(expected_node, actual_node, (), differences)
+        total = expected_node.size + actual_node.size
+        return JsonComparison(2 * matched / total if total else 1.0, differences)
+
+    def assert_similar(self, expected, actual, threshold=1.0):
+        """
+        Assert that the documents are at least 'threshold' similar, listing the differing paths otherwise.
+        """
+        comparison = self.compare(expected, actual)
+        assert comparison.similarity >= threshold, \
+            f'JSON documents are not at least {threshold:.0%} similar\n{comparison.summary()}'
+        return comparison
+
+    def _ignored(self, path):
+        return any(json_path.matches(path) for json_path in self.ignore_paths)
+
+    def _canonicalize(self, value, path):
+        if isinstance(value, dict):
+            children = {key: self._canonicalize(child, path + (key,)) for key, child in value.items()
+                        if not (self.ignore_paths and self._ignored(path + (key,)))}
+            digest = hashlib.blake2b(b'{', digest_size=16)
+            for key in sorted(children):
+                digest.update(json.dumps(key).encode())
+                digest.update(children[key].digest)
+            return _Node(value, digest.digest(), sum(child.size for child in children.values()) or 1, children)
+        if isinstance(value, list):
+            children = [self._canonicalize(child, path + (index,)) for index, child in enumerate(value)
+                        if not (self.ignore_paths and self._ignored(path + (index,)))]
+            digest = hashlib.blake2b(b'[', digest_size=16)
+            for child in children:
+                digest.update(child.digest)
+            return _Node(value, digest.digest(), sum(child.size for child in children) or 1, children)
+        return _Node(value, hashlib.blake2b(json.dumps(value).encode(), digest_size=16).digest(), 1)
+
+    def _match(self, expected, actual, path, differences):
+        """
+        :return: Number of matching scalar leaves of the two subtrees
+        """
+        if expected.digest == actual.digest:
+            return expected.size
+        if isinstance(expected.children, dict) and isinstance(actual.children, dict):
+            matched = 0
+            for key, child in expected.children.items():
+                if key in actual.children:
+                    matched += self._match(child, actual.children[key], path + (key,), differences)
+                else:
+                    differences.append((format_path(path + (key,)), child.value, None))
+            differences.extend((format_path(path + (key,)), None, child.value)
+                               for key, child in actual.children.items() if key not in expected.children)
+            return matched
+        if isinstance(expected.children, list) and isinstance(actual.children, list):
+            return self._match_items(expected.children, actual.children, path, differences)
+        differences.append((format_path(path), expected.value, actual.value))
+        return 0
+
+    def _match_items(self, expected_items, actual_items, path, differences):
+        unmatched_actual = {}
+        for index, item in enumerate(actual_items):
+            unmatched_actual.setdefault(item.digest, []).append(index)
+
+        matched, leftover_expected = 0, []
+        for index, item in enumerate(expected_items):
+            equal_items = unmatched_actual.get(item.digest)
+            if equal_items:
+                equal_items.pop(0)
+                matched += item.size
+            else:
+                leftover_expected.append(index)
+        leftover_actual = sorted(index for indexes in unmatched_actual.values() for index in indexes)
+
+        for expected_index, actual_index in zip(leftover_expected, leftover_actual):
+            matched += self._match(expected_items[expected_index], actual_items[actual_index],
+                                   path + (expected_index,), differences)
+        differences.extend((format_path(path + (index,)), expected_items[index].value, None)
+                           for index in leftover_expected[len(leftover_actual):])
+        differences.extend((format_path(path + (index,)), None, actual_items[index].value)
+                           for index in leftover_actual[len(leftover_expected):])
+        return matched
+
+
+def assert_json_similar(expected, actual, threshold=1.0, ignore_paths=()):
+    """
+    Shortcut of JsonSimilarity(ignore_paths).assert_similar(expected, actual, threshold).
+    """
+    return JsonSimilarity(ignore_paths).assert_similar(expected, actual, threshold)
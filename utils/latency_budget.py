@@ -0,0 +1,89 @@
+import re
+import time
+
+from utils.endpoint_template import to_endpoint_template
+from utils.latency_recorder import LatencyRecorder
+from utils.latency_stats import summarize
+
+_BUDGET_KEY = re.compile(r'^(p\d{1,2}|max|mean)$')
+
+
+class LatencyBudget:
+    """
+    Latency SLA of a test, declared with the 'latency_budget' marker and enforced by the 'latency_budget'
+    fixture, e.g.
+
+        @pytest.mark.latency_budget(p95=800, calls=20, endpoint='POST provider/patients')
+        def test_create_note_latency(self, latency_budget):
+            latency_budget.measure(lambda: self.appointments_page.create_ambient_appointment(auth_token=token))
+
+    Budgets are in milliseconds and may be any percentile ('p50', 'p95', 'p99', ...), 'mean' or 'max'.
+    Without 'endpoint' the wall time of each call is measured, with it the total time of the requests sent
+    to that endpoint (method & endpoint template, matched on its end) during the calls.
+    """
+
+    def __init__(self, calls=10, warmup=1, endpoint=None, **budgets):
+        """
+        :param calls: Number of measured calls
+        :param warmup: Number of calls made before measuring (connection set up, caches, ...)
+        :param endpoint: 'METHOD endpoint template' to measure instead of the whole call
+        :param budgets: Maximum milliseconds per statistic, e.g. p95=800
+        """
+        invalid_keys = [key for key in budgets if not _BUDGET_KEY.match(key)]
+        if invalid_keys:
+            raise ValueError(f'Invalid latency budget(s): {invalid_keys}. Use pN (e.g. p95), mean or max.')
+
+        self.calls = calls
+        self.warmup = warmup
+        self.endpoint = endpoint
+        self.budgets = budgets
+        self.durations = []
+        self.summary = None
+
+    def measure(self, call):
+        """
+        Run the call warmup + calls times, then check the collected timings against the budgets.
+        :param call: Function sending the request(s) under test
+        :return: Return value of the last call
+        :raises AssertionError: with the percentile breakdown if a budget is exceeded
+        """
+        result = None
+        for _ in range(self.warmup):
+            result = call()
+
+        for _ in range(self.calls):
+            position = LatencyRecorder.mark()
+            start = time.perf_counter()
+            result = call()
+            elapsed = time.perf_counter() - start
+            if self.endpoint:
+                self.durations.extend(sample['total'] * 1000 for sample in LatencyRecorder.samples_since(position)
+                                      if self._matches(sample))
+            else:
+                self.durations.append(elapsed * 1000)
+
+        self.check()
+        return result
+
+    def check(self):
+        percentiles = sorted({50, 90, 95, 99} | {int(key[1:]) for key in self.budgets if key.startswith('p')})
+        self.summary = summarize(self.durations, percentiles)
+        assert self.durations, f'No request to {self.endpoint} was sent by the measured call.'
+
+        exceeded = {key: limit for key, limit in self.budgets.items() if self.summary[key] > limit}
+        assert not exceeded, (f'Latency budget exceeded for {self.endpoint or "the measured call"}: '
+                              + ', '.join(f'{key} {self.summary[key]:.1f} ms > {limit} ms'
+                                          for key, limit in exceeded.items())
+                              + f'\n{self.breakdown()}')
+
+    def breakdown(self):
+        return ' | '.join(f'{key}={value:.1f} ms' if isinstance(value, float) else f'{key}={value}'
+                          for key, value in self.summary.items())
+
+    def _matches(self, sample):
+        method, _, endpoint = self.endpoint.partition(' ')
+        if not endpoint:
+            method, endpoint = None, method
+        endpoint = to_endpoint_template(endpoint)
+        return ((method is None or sample['method'] == method.upper())
+                and (sample['endpoint'] == endpoint or sample['endpoint'].endswith(f'/{endpoint}')))
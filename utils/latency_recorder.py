@@ -0,0 +1,117 @@
+"""
+Per-endpoint latency instrumentation of every request sent through SessionManager. Each sample is tagged
+with the method, the endpoint template (e.g. 'note/v1/provider/patients/{id}') and the status code, and
+holds two timings:
+    headers - request sent -> response headers received (requests' response.elapsed); the DNS lookup, TCP
+              connect & TLS handshake of a new connection are included, they are not measured separately
+    total   - wall time of the whole call, body included
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+from utils.endpoint_template import to_endpoint_template
+from utils.latency_stats import summarize
+
+PHASES = ('headers', 'total')
+REPORT_PERCENTILES = (50, 90, 99)
+
+
+class LatencyRecorder:
+
+    samples = []
+    _lock = threading.Lock()
+
+    @staticmethod
+    def start():
+        """
+        Start timing a request.
+        :return: Start time to pass to record()
+        """
+        return time.perf_counter()
+
+    @classmethod
+    def record(cls, method, url, response, start):
+        """
+        Store the sample of a finished request.
+        :param method: HTTP method
+        :param url: Request URL
+        :param response: requests.Response, None if the request raised
+        :param start: Value returned by start()
+        """
+        total = time.perf_counter() - start
+        sample = {
+            'method': method.upper(),
+            'endpoint': to_endpoint_template(url),
+            'status': response.status_code if response is not None else None,
+            'headers': response.elapsed.total_seconds() if response is not None else None,
+            'total': total,
+            'test': os.environ.get('PYTEST_CURRENT_TEST', '').rsplit(' ', 1)[0],
+        }
+        with cls._lock:
+            cls.samples.append(sample)
+
+    @classmethod
+    def mark(cls):
+        """
+        Return a position in the sample list, to later get the samples recorded since then.
+        """
+        return len(cls.samples)
+
+    @classmethod
+    def samples_since(cls, position):
+        with cls._lock:
+            return cls.samples[position:]
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls.samples = []
+
+    @classmethod
+    def report(cls, samples=None):
+        """
+        Aggregate the samples per method & endpoint template: count, error rate (transport errors & 5xx),
+        status codes and p50/p90/p99/max of the headers & total times in milliseconds.
+        :param samples: Samples to aggregate, all recorded samples by default
+        """
+        groups = defaultdict(list)
+        for sample in cls.samples if samples is None else samples:
+            groups[f"{sample['method']} {sample['endpoint']}"].append(sample)
+
+        report = {}
+        for key in sorted(groups):
+            group = groups[key]
+            status_counts = defaultdict(int)
+            for sample in group:
+                status_counts[str(sample['status'])] += 1
+            errors = sum(1 for sample in group if sample['status'] is None or sample['status'] >= 500)
+
+            report[key] = {
+                'count': len(group),
+                'error_rate': errors / len(group),
+                'status_codes': dict(status_counts),
+            }
+            for phase in PHASES:
+                values = [sample[phase] * 1000 for sample in group if sample[phase] is not None]
+                summary = summarize(values, REPORT_PERCENTILES)
+                report[key][f'{phase}_ms'] = {name: round(summary[name], 2)
+                                              for name in [f'p{pct}' for pct in REPORT_PERCENTILES] + ['max']
+                                              if name in summary}
+        return report
+
+    @classmethod
+    def save_report(cls, path):
+        """
+        Write the aggregated report as JSON.
+        :param path: Report file path
+        :return: The report
+        """
+        report = cls.report()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='UTF-8') as report_file:
+            json.dump(report, report_file, indent=4)
+        return report
@@ -0,0 +1,42 @@
+import math
+import statistics
+
+
+def percentile(values, pct):
+    """
+    Return the pct-th percentile (0-100) of the values using linear interpolation between closest ranks.
+    :param values: Iterable of numbers
+    :param pct: Percentile to compute, e.g. 95 for p95
+    :return: Percentile value or None if there are no values
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(values, percentiles=(50, 90, 95, 99)):
+    """
+    Summarize a list of samples (e.g. latencies in seconds).
+    :param values: Iterable of numbers
+    :param percentiles: Percentiles to include in the summary as 'p<N>' keys
+    :return: Dictionary with count, min, max, mean, stddev and the requested percentiles
+    """
+    values = list(values)
+    summary = {'count': len(values)}
+    if not values:
+        return summary
+
+    summary['min'] = min(values)
+    summary['max'] = max(values)
+    summary['mean'] = statistics.fmean(values)
+    summary['stddev'] = statistics.stdev(values) if len(values) > 1 else 0.0
+    for pct in percentiles:
+        summary[f'p{pct}'] = percentile(values, pct)
+    return summary
@@ -0,0 +1,52 @@
+import json
+import logging
+
+ROOT_LOGGER_NAME = 'ambient'
+DEFAULT_BODY_LIMIT = 2000
+
+
+def get_logger(name):
+    """
+    Return a logger under the project's root logger, e.g. get_logger('request_handler').
+    """
+    return logging.getLogger(f'{ROOT_LOGGER_NAME}.{name}')
+
+
+def configure_logging(level='INFO', body_limit=DEFAULT_BODY_LIMIT):
+    """
+    Set the verbosity of the project's loggers. Request/response bodies are logged at DEBUG level only, so
+    they are not even serialized unless DEBUG is enabled.
+    :param level: Logging level name or number, e.g. 'DEBUG' to log request & response bodies
+    :param body_limit: Maximum number of characters of a logged body, 0 or None for no limit
+    """
+    logging.getLogger(ROOT_LOGGER_NAME).setLevel(level.upper() if isinstance(level, str) else level)
+    LazyBody.limit = body_limit
+
+
+class LazyBody:
+    """
+    Deferred, truncated rendering of a JSON object or of a requests.Response body. Meant to be passed as a
+    logging argument (logger.debug('Response: %s', LazyBody(response))) so that parsing & pretty printing
+    only happen when the record is actually emitted.
+    """
+
+    limit = DEFAULT_BODY_LIMIT
+
+    def __init__(self, body, indent=4):
+        self.body = body
+        self.indent = indent
+
+    def __str__(self):
+        body = self.body
+        if hasattr(body, 'status_code'):
+            try:
+                body = body.json()
+            except ValueError:
+                body = body.text
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', errors='replace')
+
+        text = body if isinstance(body, str) else json.dumps(body, indent=self.indent, default=str)
+        if self.limit and len(text) > self.limit:
+            return f'{text[:self.limit]}... ({len(text) - self.limit} more characters)'
+        return text
@@ -0,0 +1,363 @@
+"""
+Local stand-in for the Ambient APIs, so that the harness & the load generation tooling can be exercised
+(throughput/concurrency benchmarks, offline runs) on a machine with no network access.
+
+The server implements the endpoints the page objects & the NRT upload scripts call: auth token, authorize,
+provider/patients, recording/process, transcript, audio/audios, templates, lynx/appointments and the NRT
+/command, /chunk & /streamuploadcompletion signals. Responses are built from the JSON fixtures in
+'resources/json_data' (data files where one exists, otherwise an example generated from the endpoint's
+schema). Every response can be delayed and a fraction of them replaced by an error to simulate a slow or
+flaky backend.
+
+Routes are matched on the end of the request path, so any base URL path prefix (auth/v1, note/v1, ...)
+is accepted. Use 'rebase_url' to point a configured URL at the mock server while keeping its path.
+
+Usage:
+    python -m utils.mock_server -port 8080 -latency 0.05 -jitter 0.02 -error-rate 0.01
+"""
+import argparse
+import copy
+import datetime
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import jwt
+
+from utils.app_constants import AppConstant
+
+MOCK_SIGNING_KEY = 'ambient-api-automation-mock-server'
+
+
+def load_fixture(file_name):
+    with open(os.path.join(AppConstant.JSON_DATA_FOLDER, file_name), 'r', encoding='UTF-8') as fixture_file:
+        return json.load(fixture_file)
+
+
+def example_from_schema(schema, root=None):
+    """
+    Build a minimal instance of a JSON schema: one item per array, every property of an object, and a
+    placeholder matching the 'format' of every string.
+    :param schema: JSON schema (or sub-schema)
+    :param root: Root schema '$ref's are resolved against
+    """
+    root = root or schema
+    if set(schema) <= {'$schema', '$id', 'definitions'} and schema.get('definitions'):
+        # quicktype generated schemas only hold definitions, the first one being the document itself
+        return example_from_schema(next(iter(schema['definitions'].values())), root)
+    if '$ref' in schema:
+        node = root
+        for part in schema['$ref'].lstrip('#/').split('/'):
+            node = node[part]
+        return example_from_schema(node, root)
+    for keyword in ('anyOf', 'oneOf', 'allOf'):
+        if keyword in schema:
+            return example_from_schema(schema[keyword][0], root)
+    if 'enum' in schema:
+        return schema['enum'][0]
+
+    schema_type = schema.get('type', 'object')
+    if isinstance(schema_type, list):
+        schema_type = next((item for item in schema_type if item != 'null'), 'null')
+
+    if schema_type == 'object':
+        return {key: example_from_schema(value, root) for key, value in schema.get('properties', {}).items()}
+    if schema_type == 'array':
+        return [example_from_schema(schema.get('items', {}), root)]
+    if schema_type == 'integer':
+        return 1
+    if schema_type == 'number':
+        return 1.0
+    if schema_type == 'boolean':
+        return True
+    if schema_type == 'null':
+        return None
+    return {
+        'uuid': str(uuid.uuid4()),
+        'integer': '1',
+        'date': datetime.date.today().isoformat(),
+        'date-time': datetime.datetime.now().isoformat(timespec='seconds'),
+        'email': 'mock.provider@augmedix.com',
+    }.get(schema.get('format'), 'string')
+
+
+class MockAmbientServer:
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503):
+        """
+        :param host: Interface to listen on
+        :param port: Port to listen on, 0 to pick a free one
+        :param latency: Seconds every response is delayed by
+        :param jitter: Maximum random seconds added to the latency
+        :param error_rate: Fraction (0-1) of the requests answered with 'error_status' instead
+        :param error_status: HTTP status code of the injected errors
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+        self.notes = {}
+        self.recordings = {}
+        self.audios = {}
+        self._next_note_id = 1000000
+        self._lock = threading.Lock()
+        self._thread = None
+        self._fixtures = {}
+
+        self.routes = [
+            ('POST', r'token', self.create_token),
+            ('GET', r'health', self.get_health),
+            ('POST', r'authorize', self.authorize),
+            ('DELETE', r'authorize/(?P<resource_id>[^/]+)', self.delete_authorization),
+            ('POST', r'provider/patients', self.create_note),
+            ('GET', r'provider/patients', self.list_notes),
+            ('GET', r'provider/patients/(?P<note_id>[^/]+)', self.get_note),
+            ('PUT', r'provider/patients/(?P<note_id>[^/]+)', self.update_note),
+            ('PATCH', r'provider/patients/(?P<note_id>[^/]+)', self.update_note),
+            ('DELETE', r'provider/patients/(?P<note_id>[^/]+)', self.delete_note),
+            ('PUT', r'open/internal/provider/patients', self.update_note_status),
+            ('POST', r'recording/process', self.save_recording_process),
+            ('PUT', r'recording/process', self.save_recording_process),
+            ('GET', r'recording/process', self.get_recording_process),
+            ('GET', r'transcript', self.get_transcript),
+            ('POST', r'transcript/get_notelist', self.get_note_list),
+            ('POST', r'audio/upload', self.upload_audio),
+            ('POST', r'audio', self.save_audio),
+            ('PUT', r'audio', self.save_audio),
+            ('GET', r'audios/(?:email/)?(?P<audio_id>[^/]+)', self.get_audios),
+            ('*', r'templates', self.templates),
+            ('GET', r'lynx/appointments', self.get_ehr_appointments),
+            ('POST', r'command', self.nrt_signal),
+            ('POST', r'chunk', self.nrt_signal),
+            ('POST', r'streamuploadcompletion', self.nrt_signal),
+        ]
+        self.routes = [(method, re.compile(rf'(?:^|/){pattern}/?$'), handler)
+                       for method, pattern, handler in self.routes]
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def rebase_url(self, url):
+        """
+        Point a configured URL at the mock server, keeping its path & query, e.g.
+        'https://dev-api2.augmedix.com/auth/v1' -> 'http://127.0.0.1:8080/auth/v1'. Relative paths (e.g.
+        'auth_url') are returned unchanged.
+        """
+        split_url = urlsplit(url.strip())
+        if not split_url.netloc:
+            return url
+        rebased_url = self.url + split_url.path
+        return f'{rebased_url}?{split_url.query}' if split_url.query else rebased_url
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='mock-ambient-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def dispatch(self, method, path, query, body):
+        """
+        Return the (status code, JSON body) of a request, after the configured latency & error injection.
+        """
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if self.error_rate and random.random() < self.error_rate:
+            return self.error_status, {'status': self.error_status, 'message': 'Injected error by mock server'}
+
+        path_matched = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.search(path)
+            if match:
+                path_matched = True
+                if route_method in ('*', method):
+                    try:
+                        return handler(path=path, query=query, body=body, method=method, **match.groupdict())
+                    except Exception as error:  # pylint: disable=broad-except
+                        return 500, {'status': 500, 'message': f'Mock server error: {error!r}', 'path': path}
+
+        if path_matched:
+            return 405, {'status': 405, 'message': f'Method {method} not allowed', 'path': path}
+        return 404, {'status': 404, 'message': 'Not found', 'path': path}
+
+    def fixture(self, file_name):
+        """
+        Return a copy of a JSON fixture (data or schema file) of 'resources/json_data', loaded once.
+        """
+        if file_name not in self._fixtures:
+            self._fixtures[file_name] = load_fixture(file_name)
+        return copy.deepcopy(self._fixtures[file_name])
+
+    def create_token(self, body, **_):
+        user_name = (body or {}).get('username', 'mock.provider@augmedix.com')
+        claims = {'sub': user_name, 'guid': str(uuid.uuid5(uuid.NAMESPACE_DNS, user_name)),
+                  'exp': int(time.time()) + 3600}
+        return 200, {'token': jwt.encode(claims, MOCK_SIGNING_KEY, algorithm='HS256')}
+
+    def get_health(self, path, **_):
+        return 200, self.fixture('auth_health.json' if '/auth/' in f'/{path}' else 'appointments_health.json')
+
+    def authorize(self, body, **_):
+        resources = body if isinstance(body, list) else [body or {}]
+        return 200, [{'resourceId': resource.get('resourceId') or str(uuid.uuid4()), 'success': True}
+                     for resource in resources]
+
+    def delete_authorization(self, resource_id, **_):
+        return 200, {'resourceId': resource_id, 'success': True}
+
+    def create_note(self, body, **_):
+        with self._lock:
+            self._next_note_id += 1
+            note = dict(body or {}, noteId=self._next_note_id, noteStatus='SCHEDULED')
+            self.notes[str(note['noteId'])] = note
+        return 200, note
+
+    def list_notes(self, query, **_):
+        visit_date = query.get('visitDate')
+        return 200, [note for note in self.notes.values() if not visit_date or note.get('visitDate') == visit_date]
+
+    def get_note(self, note_id, **_):
+        note = self.notes.get(note_id)
+        if note is None:
+            return 404, {'status': 404, 'message': f'Note {note_id} not found'}
+        return 200, note
+
+    def update_note(self, note_id, body, **_):
+        if note_id not in self.notes:
+            return 404, {'status': 404, 'message': f'Note {note_id} not found'}
+        self.notes[note_id].update(body or {})
+        return 200, self.notes[note_id]
+
+    def update_note_status(self, query, **_):
+        note = self.notes.get(query.get('noteId'))
+        if note is not None:
+            note['noteStatus'] = query.get('noteStatus')
+        return 200, None
+
+    def delete_note(self, note_id, **_):
+        self.notes.pop(note_id, None)
+        return 200, None
+
+    def save_recording_process(self, body, **_):
+        recording_process = dict(body or {}, status='COMPLETED')
+        for container in recording_process.setdefault('recordingProcessContainers', [{}]):
+            container.setdefault('streamId', str(uuid.uuid4()))
+        self.recordings[str(recording_process.get('noteId'))] = recording_process
+        return 200, None
+
+    def get_recording_process(self, query, **_):
+        note_ids = query.get('noteIds', '').split(',')
+        return 200, [self.recordings[note_id] for note_id in note_ids if note_id in self.recordings]
+
+    def get_transcript(self, query, **_):
+        transcript = self.fixture('transcript_response.json')
+        transcript.update(status='COMPLETED', streamId=query.get('streamId'))
+        return 200, transcript
+
+    def get_note_list(self, body, **_):
+        return 200, [{'noteId': note_id, 'status': 'COMPLETED'} for note_id in body or []]
+
+    def upload_audio(self, body, **_):
+        return 200, {'noteId': (body or {}).get('noteId'), 'streamId': str(uuid.uuid4())}
+
+    def save_audio(self, body, **_):
+        audio = dict(body or {})
+        audio.setdefault('uniqueId', str(uuid.uuid4()))
+        for key in ('uniqueId', 'noteId', 'recordingId', 'providerId', 'email'):
+            if audio.get(key) is not None:
+                self.audios.setdefault(str(audio[key]), []).append(audio)
+        return 200, audio
+
+    def get_audios(self, audio_id, **_):
+        return 200, self.audios.get(audio_id, [])
+
+    def templates(self, method, query, body, **_):
+        return 200, dict(body or {}, email=query.get('email'), templates=[]) if method != 'DELETE' else None
+
+    def get_ehr_appointments(self, **_):
+        appointments = example_from_schema(self.fixture('ehr_appointments_schema.json'))
+        appointments.update(code='000', message='Success')
+        return 200, appointments
+
+    def nrt_signal(self, **_):
+        return 200, {'status': 'OK'}
+
+    def _handler_class(self):
+        server = self
+
+        class MockRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True  # headers & body are separate writes, don't let them wait for an ACK
+
+            def _handle(self):
+                split_url = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(split_url.query).items()}
+                length = int(self.headers.get('Content-Length') or 0)
+                raw_body = self.rfile.read(length) if length else b''
+                try:
+                    body = json.loads(raw_body) if raw_body else None
+                except ValueError:
+                    body = None
+
+                status, response_body = server.dispatch(self.command, split_url.path, query, body)
+                content = b'' if response_body is None else json.dumps(response_body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                pass
+
+        return MockRequestHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in mock server for the Ambient APIs.')
+    parser.add_argument("-host", "--host", dest="host", default='127.0.0.1', help="Interface to listen on.")
+    parser.add_argument("-port", "--port", dest="port", type=int, default=8080, help="Port to listen on.")
+    parser.add_argument("-latency", "--latency", dest="latency", type=float, default=0.0, help="Seconds every response is delayed by.")
+    parser.add_argument("-jitter", "--jitter", dest="jitter", type=float, default=0.0, help="Maximum random seconds added to the latency.")
+    parser.add_argument("-error-rate", "--error-rate", dest="error_rate", type=float, default=0.0, help="Fraction (0-1) of requests answered with an error.")
+    parser.add_argument("-error-status", "--error-status", dest="error_status", type=int, default=503, help="HTTP status code of the injected errors.")
+    args = parser.parse_args()
+
+    server = MockAmbientServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                               error_rate=args.error_rate, error_status=args.error_status)
+    print(f'Mock Ambient API server listening on {server.url}')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
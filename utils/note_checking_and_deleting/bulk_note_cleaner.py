@@ -0,0 +1,122 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytz
+import requests
+
+from utils.config_parser import Config
+from utils.note_checking_and_deleting.delete_note import delete_note_by_id, get_note_headers
+from utils.s2t_handler import S2THandler
+from utils.session_manager import SessionManager
+from utils.token_cache import TokenCache
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+REQUIRED_CONFIGS = ('api_base_url', 'auth_url', 'notes', 's2t_provider_id', 's2t_site_id')
+
+
+class BulkNoteCleaner:
+    """
+    Deletes the notes of a visit date with bounded concurrency. The note listing is fetched page by page,
+    one cached scribe token is used for every request, failed deletions (throttling, 5xx, connection errors)
+    are retried with exponential backoff, and the notes can be narrowed down to the patient names starting
+    with a run tag so that parallel runs don't delete each other's data.
+    The S2T provider's IDs ('s2t_provider_id', 's2t_site_id') and the scribe's 'password' are not defined in the
+    properties files; provide them as encrypted AXGO_* environment variables (see SecretStore).
+    """
+
+    def __init__(self, user_name=None, password=None, max_workers=8, retries=3, backoff=1, page_size=100,
+                 patient_name_prefix=None):
+        """
+        :param user_name: Scribe logging in, 's2t_scribe' config by default
+        :param password: Password of the scribe, 'password' config by default
+        :param max_workers: Maximum number of concurrent deletions
+        :param retries: Number of retries of a failed deletion
+        :param backoff: Seconds before the first retry, doubled for every following one
+        :param page_size: Number of notes fetched per listing request
+        :param patient_name_prefix: Only delete the notes whose patient name starts with this run tag
+        """
+        missing = [key for key in REQUIRED_CONFIGS + (() if user_name else ('s2t_scribe',))
+                   + (() if password else ('password',)) if not Config.get(key)]
+        if missing:
+            raise RuntimeError(f'Missing config(s) for the note cleanup: {", ".join(missing)}. Please add them to the '
+                               f'properties files or as encrypted AXGO_<KEY> environment variables.')
+
+        self.user_name = user_name or Config.get('s2t_scribe')
+        self.password = password or Config.get('password')
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.page_size = page_size
+        self.patient_name_prefix = patient_name_prefix
+        self.api_base_url = Config.get('api_base_url')
+        self.note_api = Config.get('notes')
+        self.provider_id = Config.get('s2t_provider_id')
+        self.site_id = Config.get('s2t_site_id')
+
+    def get_token(self):
+        return TokenCache.get_token((self.api_base_url, self.user_name, self.password),
+                                    lambda: S2THandler.get_auth_token(self.user_name, self.password))
+
+    def list_notes(self, visit_date=None):
+        """
+        Return every note of the provider on the visit date (today in PST by default), page by page.
+        :param visit_date: Visit date formatted as dd-mm-YYYY
+        """
+        visit_date = visit_date or datetime.now(pytz.timezone('America/Los_Angeles')).strftime("%d-%m-%Y")
+        request_path = f"{self.note_api}/notes/patients?patientVisitDate={visit_date}&providerId={self.provider_id}&scribeControl=Full%20Control&trainerNote=false&providerEmail=s2tnrtprovider@augmedix.com&providerFirstName=S2T&providerLastName=NRT&siteId={self.site_id}&nonRealTimeMode=true"
+
+        notes, seen_ids, page = [], set(), 0
+        while True:
+            response = SessionManager.request('GET', self.api_base_url,
+                                              f'{request_path}&page={page}&size={self.page_size}',
+                                              headers=get_note_headers(self.get_token()))
+            response.raise_for_status()
+            page_notes = [note for note in response.json() if note['id'] not in seen_ids]
+            notes.extend(page_notes)
+            seen_ids.update(note['id'] for note in page_notes)
+            # Stop on a short page, or when the API ignores paging and serves the same notes again.
+            if len(page_notes) < self.page_size:
+                return notes
+            page += 1
+
+    def select_notes(self, notes):
+        if not self.patient_name_prefix:
+            return notes
+        return [note for note in notes if (note.get('patientName') or '').startswith(self.patient_name_prefix)]
+
+    def delete_note(self, note_id):
+        """
+        Delete a note, retrying on throttling, server & connection errors. A missing note counts as deleted.
+        :return: Final status code, or the error of the last attempt
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                status_code = delete_note_by_id(note_id, self.get_token(), print_response=False).status_code
+                if status_code not in RETRY_STATUS_CODES:
+                    return status_code
+                result = status_code
+            except requests.RequestException as error:
+                result = repr(error)
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** attempt)
+        return result
+
+    def clean(self, visit_date=None):
+        """
+        Delete the selected notes of the visit date concurrently.
+        :param visit_date: Visit date formatted as dd-mm-YYYY, today in PST by default
+        :return: Dictionary of note ID -> final status code (or error)
+        """
+        notes = self.select_notes(self.list_notes(visit_date))
+        if not notes:
+            return {}
+
+        note_ids = [note['id'] for note in notes]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(note_ids)),
+                                thread_name_prefix='note-cleaner') as executor:
+            results = dict(zip(note_ids, executor.map(self.delete_note, note_ids)))
+
+        failed = {note_id: result for note_id, result in results.items() if result not in (200, 204, 404)}
+        print(f'{len(results) - len(failed)}/{len(results)} note(s) deleted. Failed: {failed}')
+        return results
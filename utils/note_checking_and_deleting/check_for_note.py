@@ -1,52 +1,58 @@
-import datetime
-import json
-from datetime import datetime
+import argparse
 
 import pytest
-import pytz
-import requests
-from requests.structures import CaseInsensitiveDict
-
-import utils.note_checking_and_deleting.delete_note as delete_note
-from utils.note_checking_and_deleting.get_auth_token import get_auth_token
-
-
-def check_current_notes_and_delete():
-    api_base_url = pytest.configs.get_config('api_base_url')
-    note_api = pytest.configs.get_config('notes')
-    token = get_auth_token('s2tnrtscribe@augmedix.com', '@ugmed1X@')
-    print(token)
-    pst = pytz.timezone('America/Los_Angeles')
-    date = datetime.now(pst)
-
-    date_time = date.strftime("%d-%m-%Y")
-    print("date and time:", date_time)
-
-    url = f"{api_base_url}/{note_api}/notes/patients?patientVisitDate={date_time}&providerId={pytest.configs.get_config('provider_id')}&scribeControl=Full%20Control&trainerNote=false&providerEmail=s2tnrtprovider@augmedix.com&providerFirstName=S2T&providerLastName=NRT&siteId={pytest.configs.get_config('site_id')}&nonRealTimeMode=true"
-    print(url)
-    headers = CaseInsensitiveDict()
-    headers["accept"] = "application/json, text/plain, */*"
-    headers["accept-language"] = "en-US,en;q=0.9"
-    headers[
-        "authorization"] = f"Bearer {token}"
-    headers["sec-ch-ua"] = "Not A;Brand;v=99, Chromium;v=101, Google Chrome;v=101"
-    headers["sec-ch-ua-mobile"] = "?0"
-    headers["sec-ch-ua-platform"] = "Windows"
-    headers["sec-fetch-dest"] = "empty"
-    headers["sec-fetch-mode"] = "cors"
-    headers["sec-fetch-site"] = "same-site"
-    headers[
-        "user-agent"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/101.0.4951.67 Safari/537.36"
-
-    resp = requests.get(url, headers=headers)
-
-    print(len(resp.json()))
-    print(resp.text)
-    for x in resp.json():
-        #print(json.dumps(x, indent=4, sort_keys=True))
-        print(x['id'])
-        delete_note.delete_note_by_id(x['id'], token)
-
-    return token
-if __name__=="__main__":
-    check_current_notes_and_delete()
\ No newline at end of file
+
+from utils.app_constants import AppConstant
+from utils.config_parser import ConfigParser
+from utils.note_checking_and_deleting.bulk_note_cleaner import BulkNoteCleaner
+from utils.secret_store import SecretStore
+
+ENV_CONFIGS = {'dev': AppConstant.DEV_CONFIG, 'demo': AppConstant.DEMO_CONFIG,
+               'staging': AppConstant.STAGING_CONFIG, 'production': AppConstant.PRODUCTION_CONFIG}
+
+
+def load_configs(env='dev'):
+    """
+    Load the configs of the environment the way pytest_configure (conftest.py) does, for use outside pytest.
+    :param env: dev/demo/staging/production
+    """
+    configs = ConfigParser()
+    configs.add_file(ENV_CONFIGS[env])
+    configs.add_file(AppConstant.SYSTEM_CONFIG)
+    configs.add_file(AppConstant.DATA_CONFIG)
+    configs.load_configs()
+    configs.add_secrets(SecretStore(configs.get_config('environment_variable_prefix')))
+    pytest.configs = configs
+    return configs
+
+
+def check_current_notes_and_delete(patient_name_prefix=None, max_workers=8, retries=3):
+    """
+    Delete today's notes of the S2T provider in bulk.
+    :param patient_name_prefix: Only delete the notes whose patient name starts with this run tag
+    :param max_workers: Maximum number of concurrent deletions
+    :param retries: Number of retries of a failed deletion
+    :return: Scribe token used for the cleanup
+    """
+    cleaner = BulkNoteCleaner(max_workers=max_workers, retries=retries, patient_name_prefix=patient_name_prefix)
+    cleaner.clean()
+    return cleaner.get_token()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete today's notes of the S2T provider.")
+    parser.add_argument("-env", "--env", dest="env", default='dev', choices=sorted(ENV_CONFIGS),
+                        help="Environment whose configs are loaded.")
+    parser.add_argument("-prefix", "--prefix", dest="patient_name_prefix", default=None,
+                        help="Only delete the notes whose patient name starts with this run tag.")
+    parser.add_argument("-workers", "--workers", dest="max_workers", type=int, default=8,
+                        help="Maximum number of concurrent deletions.")
+    parser.add_argument("-retries", "--retries", dest="retries", type=int, default=3,
+                        help="Number of retries of a failed deletion.")
+    args = parser.parse_args()
+    load_configs(args.env)
+    check_current_notes_and_delete(args.patient_name_prefix, args.max_workers, args.retries)
+
+
+if __name__ == "__main__":
+    main()
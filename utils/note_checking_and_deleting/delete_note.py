@@ -1,13 +1,10 @@
-import pytest
-import requests
 from requests.structures import CaseInsensitiveDict
 
+from utils.config_parser import Config
+from utils.session_manager import SessionManager
 
-def delete_note_by_id(id, token):
-    api_base_url = pytest.configs.get_config('api_base_url')
-    note_api = pytest.configs.get_config('notes')
-    url = f"{api_base_url}/{note_api}/notes/patient/{id}"
 
+def get_note_headers(token):
     headers = CaseInsensitiveDict()
     headers["accept"] = "application/json, text/plain, */*"
     headers["accept-language"] = "en-US,en;q=0.9"
@@ -21,11 +18,16 @@ def delete_note_by_id(id, token):
     headers["sec-fetch-site"] = "same-site"
     headers[
         "user-agent"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/101.0.4951.67 Safari/537.36"
-
-    resp = requests.delete(url, headers=headers)
-
-    print(resp.text)
+    return headers
 
 
+def delete_note_by_id(id, token, print_response=True):
+    api_base_url = Config.get('api_base_url')
+    note_api = Config.get('notes')
 
+    resp = SessionManager.request('DELETE', api_base_url, f'{note_api}/notes/patient/{id}',
+                                  headers=get_note_headers(token))
 
+    if print_response:
+        print(resp.text)
+    return resp
@@ -0,0 +1,143 @@
+# pylint: disable=no-member
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+import pytest
+from jwt import DecodeError
+
+from pages.appointments_api_page import AppointmentsApiPage
+from utils.request_handler import RequestHandler
+
+
+class NotePool:
+    """
+    Session-wide pool of pre-provisioned (created & authorized) ambient appointments/notes. Suites lease a
+    fresh note in their setup instead of creating one serially: notes are created in concurrent batches, so
+    the setup latency is paid once per batch instead of once per class. Every note created by the pool is
+    deleted in bulk at the end of the session (see the 'note_pool' fixture).
+    Notes are pooled per provider (the 'uid' claim of the token), so a refreshed token of the same provider
+    leases from the same pool. They are deleted with a fresh token of their provider: logged in again
+    (through TokenCache) for the providers leased by credentials, the latest token seen otherwise.
+    Pool sizes are read from the 'note_pool_batch_size' & 'note_pool_max_workers' keys of the loaded configs.
+    """
+
+    DEFAULT_BATCH_SIZE = 4
+    DEFAULT_MAX_WORKERS = 4
+
+    _available = defaultdict(deque)
+    _created = []
+    _credentials = {}
+    _latest_tokens = {}
+    _lock = threading.Lock()
+    _provision_locks = defaultdict(threading.Lock)
+
+    @classmethod
+    def lease(cls, auth_token=None, user_name=None, password=None):
+        """
+        Hand out a note of the provider owning the token (or of the given user) that no one leased before,
+        provisioning a new batch if none is left.
+        :return: Same tuple as AppointmentsApiPage.create_ambient_appointment
+        """
+        token = auth_token if auth_token else RequestHandler.get_auth_token(user_name=user_name, password=password)
+        owner = cls._remember(token, user_name, password)
+        with cls._lock:
+            provision_lock = cls._provision_locks[owner]
+        with provision_lock:
+            if not cls._available[owner]:
+                cls.provision(token, cls._get_int_config('note_pool_batch_size', cls.DEFAULT_BATCH_SIZE))
+            return cls._available[owner].popleft()
+
+    @classmethod
+    def provision(cls, auth_token, count, authorize=True):
+        """
+        Create & authorize notes concurrently and add them to the pool. Every note is created through its own
+        AppointmentsApiPage, so that concurrent requests never share headers or payloads.
+        :param auth_token: Token of the provider owning the notes
+        :param count: Number of notes to create
+        :param authorize: Whether to authorize the provider on the notes
+        """
+        def create_note(_):
+            # One page per task: the page methods modify the headers & payload of their page in place.
+            appointments_page = AppointmentsApiPage()
+            note = appointments_page.create_ambient_appointment(auth_token=auth_token)
+            note_id = note[2]
+            if note_id is None:
+                raise AssertionError(f'Note could not be created: {note[0]}')
+            if authorize:
+                appointments_page.authorization_page.create_resource(auth_token=auth_token, note_id=note_id)
+            return note
+
+        max_workers = min(count, cls._get_int_config('note_pool_max_workers', cls.DEFAULT_MAX_WORKERS)) or 1
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='note-pool') as executor:
+            notes = list(executor.map(create_note, range(count)))
+
+        owner = cls._remember(auth_token)
+        with cls._lock:
+            cls._available[owner].extend(notes)
+            cls._created.extend((owner, note[2]) for note in notes)
+        print(f'{len(notes)} note(s) provisioned: {[note[2] for note in notes]}')
+
+    @classmethod
+    def cleanup(cls):
+        """
+        Delete every note created by the pool, concurrently. Safe to call more than once.
+        """
+        with cls._lock:
+            created, cls._created = cls._created, []
+            cls._available.clear()
+        if not created:
+            return
+
+        tokens = {owner: cls._fresh_token(owner) for owner in {owner for owner, _ in created}}
+
+        def delete_note(owner_and_note_id):
+            owner, note_id = owner_and_note_id
+            try:
+                return AppointmentsApiPage().delete_appointment_note(note_id, auth_token=tokens[owner])[3].status_code
+            except Exception as error:  # pylint: disable=broad-except
+                return repr(error)
+
+        max_workers = min(len(created), cls._get_int_config('note_pool_max_workers', cls.DEFAULT_MAX_WORKERS))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='note-pool') as executor:
+            results = list(executor.map(delete_note, created))
+        print(f'{len(created)} pooled note(s) deleted: {dict(zip((note_id for _, note_id in created), results))}')
+
+    @staticmethod
+    def get_owner(auth_token):
+        """
+        :return: ID of the provider owning the token ('uid' or 'guid' claim), the token itself if it isn't a JWT
+        """
+        try:
+            claims = jwt.decode(auth_token, options={"verify_signature": False})
+        except DecodeError:
+            return auth_token
+        return str(claims.get('uid') or claims.get('guid') or auth_token)
+
+    @classmethod
+    def _remember(cls, auth_token, user_name=None, password=None):
+        owner = cls.get_owner(auth_token)
+        with cls._lock:
+            cls._latest_tokens[owner] = auth_token
+            if user_name and password:
+                cls._credentials[owner] = (user_name, password)
+        return owner
+
+    @classmethod
+    def _fresh_token(cls, owner):
+        credentials = cls._credentials.get(owner)
+        if credentials:
+            try:
+                return RequestHandler.get_auth_token(user_name=credentials[0], password=credentials[1])
+            except Exception as error:  # pylint: disable=broad-except
+                print(f'Login of {credentials[0]} failed, deleting its pooled notes with the latest token: {error!r}')
+        return cls._latest_tokens[owner]
+
+    @staticmethod
+    def _get_int_config(key, default):
+        configs = getattr(pytest, 'configs', None)
+        try:
+            return int(configs.get_config(key) or default) if configs else default
+        except ValueError:
+            return default
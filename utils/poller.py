@@ -0,0 +1,93 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Poller:
+    """
+    Reusable polling engine for long-running jobs (recording processes, transcripts, streamIds, ...).
+    The wait between two attempts grows exponentially from 'interval' up to 'max_interval' with a random
+    jitter on top, polling stops as soon as the job reaches a done or a terminal failure state and the whole
+    wait is bounded by a deadline ('timeout' seconds) and optionally by a number of attempts.
+    """
+
+    def __init__(self, timeout=60, interval=1, max_interval=10, backoff=2, jitter=0.1, max_attempts=None):
+        """
+        :param timeout: Deadline in seconds for the whole polling
+        :param interval: Wait in seconds after the first unsuccessful attempt
+        :param max_interval: Upper bound of the wait in seconds between two attempts
+        :param backoff: Multiplier applied to the wait after every unsuccessful attempt
+        :param jitter: Fraction of the wait added/subtracted randomly to spread concurrent pollers
+        :param max_attempts: Maximum number of attempts, unlimited (only the deadline applies) if None
+        """
+        self.timeout = timeout
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.max_attempts = max_attempts
+
+    def poll(self, fetch, until, fail_when=None, description='Job', timeout_error=TimeoutError):
+        """
+        Call 'fetch' until 'until' accepts its result.
+        :param fetch: Callable without arguments returning the current state of the job
+        :param until: Callable returning True once the fetched state is the expected (done) one
+        :param fail_when: Callable returning True if the fetched state is a terminal failure, polling stops
+                          immediately with an AssertionError then
+        :param description: Name of the job used in the logs & error messages
+        :param timeout_error: Exception class raised when the deadline or max_attempts is reached. If None,
+                              the last fetched state is returned instead of raising.
+        :return: The fetched state accepted by 'until'
+        """
+        deadline = time.monotonic() + self.timeout
+        wait = self.interval
+        attempt = 0
+        state = None
+
+        while True:
+            attempt += 1
+            state = fetch()
+
+            if until(state):
+                print(f'{description}: done after {attempt} attempt(s).')
+                return state
+            if fail_when and fail_when(state):
+                raise AssertionError(f'{description}: unexpected state {state}')
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (self.max_attempts and attempt >= self.max_attempts):
+                break
+
+            sleep_for = min(wait * (1 + random.uniform(-self.jitter, self.jitter)), remaining)
+            print(f'{description}: polling attempt {attempt} not done yet. Retrying in {sleep_for:.2f}s...')
+            time.sleep(sleep_for)
+            wait = min(wait * self.backoff, self.max_interval)
+
+        message = f'{description} did not complete within the expected time.'
+        if timeout_error is None:
+            print(message)
+            return state
+        raise timeout_error(message)
+
+    def poll_many(self, fetchers, until, fail_when=None, description='Job', timeout_error=TimeoutError,
+                  max_workers=None):
+        """
+        Poll many jobs (e.g. several note/stream IDs) concurrently with the same rules as 'poll'.
+        :param fetchers: Dictionary of job ID -> callable returning the current state of that job
+        :param until: Callable returning True once a fetched state is the expected (done) one
+        :param fail_when: Callable returning True if a fetched state is a terminal failure
+        :param description: Name of the jobs used in the logs & error messages
+        :param timeout_error: Exception class raised when a job does not finish in time (see 'poll')
+        :param max_workers: Maximum number of jobs polled at the same time, all of them if None
+        :return: Dictionary of job ID -> fetched state accepted by 'until'
+        """
+        if not fetchers:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(fetchers)) as executor:
+            futures = {
+                job_id: executor.submit(self.poll, fetch, until, fail_when, f'{description} [{job_id}]',
+                                        timeout_error)
+                for job_id, fetch in fetchers.items()
+            }
+            return {job_id: future.result() for job_id, future in futures.items()}
@@ -1,35 +1,43 @@
 # pylint: disable=no-member
+import asyncio
 import datetime
 import jwt
-import requests
 import json
+import logging
 import pytest
 from requests import JSONDecodeError
 from utils.api_request_data_handler import APIRequestDataHandler
+from utils.config_parser import Config
+from utils.logger import LazyBody, get_logger
+from utils.session_manager import SessionManager
+from utils.token_cache import TokenCache
 import os
 
+logger = get_logger('request_handler')
+
 
 class RequestHandler:
 
     @classmethod
-    def get_response(cls, base_url=pytest.configs.get_config('ehr_base_url'), request_path='', request_type='GET', headers=None, payload=None):
+    def get_response(cls, base_url=None, request_path='', request_type='GET', headers=None, payload=None):
         """
         Send request to specified url as per request type and returns the response in JSON format.
-        :param base_url: Base URL of the API
+        :param base_url: Base URL of the API, 'ehr_base_url' config by default
         :param request_path: Path of the API endpoint
         :param request_type: "GET", "POST", "PUT", "DELETE"
         :param headers: Headers to be sent for the specific request
         :param payload: Data to be sent for the request
         """
-        response = requests.request(request_type, f'{base_url}/{request_path}', headers=headers, data=payload)
+        base_url = base_url or Config.get('ehr_base_url')
+        response = SessionManager.request(request_type, base_url, request_path, headers=headers, data=payload)
         return response
 
     @classmethod
-    def get_api_response(cls, base_url=pytest.configs.get_config('ehr_base_url'), request_path='',
+    def get_api_response(cls, base_url=None, request_path='',
                          request_type='GET', headers=None, payload=None, user_name=None, password=None, token=None):
         """
         Send request to specified url as per request type and returns the response in JSON format.
-        :param base_url: Base URL of the API
+        :param base_url: Base URL of the API, 'ehr_base_url' config by default
         :param request_path: Path of the API endpoint
         :param request_type: "GET", "POST", "PUT", "DELETE"
         :param headers: Headers to be sent for the specific request
@@ -38,53 +46,140 @@ class RequestHandler:
         :param password: Password for authentication
         :param token: Authorization token
         """
-        if token:
-            auth_token = token
-        else:
-            auth_token = cls.get_auth_token(user_name=user_name, password=password)
+        base_url = base_url or Config.get('ehr_base_url')
+        if not headers:
+            auth_token = token if token else cls.get_auth_token(user_name=user_name, password=password)
+            headers = cls.get_auth_headers(auth_token)
 
-        json_data = APIRequestDataHandler('authentication')
+        response = SessionManager.request(request_type, base_url, request_path, headers=headers, data=payload)
+        cls.log_response(response, base_url, request_path, request_type, payload)
+        return response
 
-        if not headers:
-            headers = json_data.get_modified_headers(Authorization=f'Bearer {auth_token}')
+    @classmethod
+    async def async_get_response(cls, base_url=None, request_path='',
+                                 request_type='GET', headers=None, payload=None):
+        """
+        Asyncio counterpart of get_response. The request is sent through the same pooled session on a worker
+        thread, so many calls can be awaited concurrently on one event loop.
+        :param base_url: Base URL of the API, 'ehr_base_url' config by default
+        :param request_path: Path of the API endpoint
+        :param request_type: "GET", "POST", "PUT", "DELETE"
+        :param headers: Headers to be sent for the specific request
+        :param payload: Data to be sent for the request
+        """
+        base_url = base_url or Config.get('ehr_base_url')
+        return await asyncio.to_thread(SessionManager.request, request_type, base_url, request_path,
+                                       headers=headers, data=payload)
 
-        response = requests.request(request_type, f'{base_url}/{request_path}', headers=headers, data=payload)
+    @classmethod
+    async def async_get_api_response(cls, base_url=None, request_path='',
+                                     request_type='GET', headers=None, payload=None, user_name=None, password=None,
+                                     token=None):
+        """
+        Asyncio counterpart of get_api_response.
+        :param base_url: Base URL of the API, 'ehr_base_url' config by default
+        :param request_path: Path of the API endpoint
+        :param request_type: "GET", "POST", "PUT", "DELETE"
+        :param headers: Headers to be sent for the specific request
+        :param payload: Data to be sent for the request
+        :param user_name: Username for authentication
+        :param password: Password for authentication
+        :param token: Authorization token
+        """
+        base_url = base_url or Config.get('ehr_base_url')
+        if not headers:
+            auth_token = token if token else await cls.async_get_auth_token(user_name=user_name, password=password)
+            headers = cls.get_auth_headers(auth_token)
 
-        # Debugging information
-        print(f'Payload: {payload}')
-        print(f'{request_type}: {base_url}/{request_path} -- {response.status_code}')
-        try:
-            print(f'Response: {json.dumps(response.json(), indent=4)}')
-        except JSONDecodeError:
-            print(f'Response: {response}')
+        response = await cls.async_get_response(base_url=base_url, request_path=request_path,
+                                                request_type=request_type, headers=headers, payload=payload)
+        cls.log_response(response, base_url, request_path, request_type, payload)
         return response
 
     @classmethod
-    def get_auth_token(cls, base_url=pytest.configs.get_config('auth_base_url'), user_name=None, password=None):
+    async def async_get_auth_token(cls, base_url=None, user_name=None,
+                                   password=None, use_cache=True):
         """
-        Get the authentication token by sending a request to the authentication endpoint.
-        :param base_url: Base URL of the authentication API
+        Asyncio counterpart of get_auth_token.
+        :param base_url: Base URL of the authentication API, 'auth_base_url' config by default
         :param user_name: Username for authentication
         :param password: Password for authentication
+        :param use_cache: Whether a cached token may be returned instead of logging in again
         :return: Authentication token
         """
-        response = cls.get_auth_response(base_url=base_url, user_name=user_name, password=password)
-        json_response = response.json()
-        return json_response.get('token', 'Token Not Found')
+        return await asyncio.to_thread(cls.get_auth_token, base_url=base_url, user_name=user_name,
+                                       password=password, use_cache=use_cache)
+
+    @staticmethod
+    def get_auth_headers(auth_token):
+        """
+        Return the default request headers carrying the given bearer token.
+        :param auth_token: Authorization token
+        """
+        json_data = APIRequestDataHandler('authentication')
+        return json_data.get_modified_headers(Authorization=f'Bearer {auth_token}')
+
+    @staticmethod
+    def log_response(response, base_url, request_path, request_type, payload):
+        """
+        Log debugging information of a sent request. Payload & response bodies are only serialized when
+        DEBUG logging is enabled.
+        """
+        logger.info('%s: %s/%s -- %s', request_type, base_url, request_path, response.status_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Payload: %s', LazyBody(payload))
+            logger.debug('Response: %s', LazyBody(response))
+
+    @classmethod
+    def get_auth_token(cls, base_url=None, user_name=None, password=None,
+                       use_cache=True):
+        """
+        Get the authentication token by sending a request to the authentication endpoint. Tokens are served
+        from the process-wide TokenCache until they are about to expire.
+        :param base_url: Base URL of the authentication API, 'auth_base_url' config by default
+        :param user_name: Username for authentication
+        :param password: Password for authentication
+        :param use_cache: Whether a cached token may be returned instead of logging in again
+        :return: Authentication token
+        """
+        base_url = base_url or Config.get('auth_base_url')
+
+        def fetch_token():
+            response = cls.get_auth_response(base_url=base_url, user_name=user_name, password=password)
+            json_response = response.json()
+            return json_response.get('token', 'Token Not Found')
+
+        if not use_cache:
+            return fetch_token()
+
+        key = (base_url,
+               user_name or pytest.configs.get_config('lynx_enabled_rt_provider2'),
+               password or pytest.configs.get_config('all_provider_password'))
+        return TokenCache.get_token(key, fetch_token)
+
+    @classmethod
+    def invalidate_auth_token(cls, user_name=None):
+        """
+        Drop cached auth tokens of the given user (or of every user) so the next call logs in again.
+        :param user_name: Username whose cached tokens should be dropped
+        """
+        TokenCache.invalidate(user_name=user_name)
 
     @classmethod
-    def get_auth_response(cls, base_url=pytest.configs.get_config('auth_base_url'), request_type='POST',
-                          request_path=pytest.configs.get_config('auth_path'), user_name=None, password=None, printData=False):
+    def get_auth_response(cls, base_url=None, request_type='POST',
+                          request_path=None, user_name=None, password=None, printData=False):
         """
         Send a request to the authentication endpoint and return the response.
-        :param base_url: Base URL of the authentication API
+        :param base_url: Base URL of the authentication API, 'auth_base_url' config by default
         :param request_type: "POST"
-        :param request_path: Path of the authentication endpoint
+        :param request_path: Path of the authentication endpoint, 'auth_path' config by default
         :param user_name: Username for authentication
         :param password: Password for authentication
         :param printData: Whether to print debugging information
         :return: Response object
         """
+        base_url = base_url or Config.get('auth_base_url')
+        request_path = request_path or Config.get('auth_path')
         json_data = APIRequestDataHandler('authentication')
         payload = json_data.get_modified_payload(username=pytest.configs.get_config('lynx_enabled_rt_provider2'),
                                                  password=pytest.configs.get_config('all_provider_password'))
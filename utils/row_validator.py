@@ -0,0 +1,112 @@
+import re
+from operator import itemgetter
+
+_MISSING = object()
+
+
+class FieldRule:
+    """
+    Check of one field (column) of every row. The check is compiled once and applied to the whole column.
+    """
+
+    def __init__(self, description, is_valid, is_valid_column=None):
+        """
+        :param description: Human readable rule, shown for the failing rows
+        :param is_valid: Callable returning whether a (present) value is valid
+        :param is_valid_column: Optional callable returning whether every value of a column is valid in one
+                                (C level) pass; the values are only checked one by one if it returns False
+        """
+        self.description = description
+        self.is_valid = is_valid
+        self.is_valid_column = is_valid_column
+
+    def failing_rows(self, column):
+        """
+        :param column: Values of the field in every row, _MISSING for the rows without the field
+        :return: Indexes of the rows whose value breaks the rule
+        """
+        if self.is_valid_column:
+            try:
+                if self.is_valid_column(column):
+                    return []
+            except TypeError:
+                pass
+        return [index for index, valid in enumerate(map(self._check, column)) if not valid]
+
+    def _check(self, value):
+        if value is _MISSING:
+            return False
+        try:
+            return bool(self.is_valid(value))
+        except TypeError:
+            # e.g. None or a number where a string is expected
+            return False
+
+
+def pattern(regex):
+    """
+    The whole value should match the regex, e.g. pattern(r'\\d+').
+    """
+    compiled = re.compile(regex)
+    return FieldRule(f'matches {regex}', compiled.fullmatch, lambda column: all(map(compiled.fullmatch, column)))
+
+
+def length(size):
+    return FieldRule(f'length == {size}', lambda value: len(value) == size,
+                     lambda column: set(map(len, column)) <= {size})
+
+
+def min_length(size):
+    return FieldRule(f'length >= {size}', lambda value: len(value) >= size,
+                     lambda column: min(map(len, column), default=size) >= size)
+
+
+class RowValidator:
+    """
+    Validates every row of a list of records (e.g. the 'dataList' of a response) against per field rules,
+    column by column, and reports every failing row & field at once instead of stopping at the first one.
+    """
+
+    def __init__(self, rules):
+        """
+        :param rules: Dictionary of field name -> FieldRule, e.g. {'patientId': pattern(r'\\d+')}
+        """
+        self.rules = rules
+
+    def validate(self, rows):
+        """
+        :param rows: List of dictionaries
+        :return: List of (row index, field, value, rule description) tuples of the failing values, by row
+        """
+        failures = []
+        for field, rule in self.rules.items():
+            try:
+                column = list(map(itemgetter(field), rows))
+            except (KeyError, TypeError):
+                column = [row.get(field, _MISSING) if isinstance(row, dict) else _MISSING for row in rows]
+            failures.extend((index, field, None if column[index] is _MISSING else column[index], rule.description)
+                            for index in rule.failing_rows(column))
+        return sorted(failures, key=lambda failure: failure[0])
+
+    def assert_valid(self, rows, limit=20):
+        """
+        Assert that every row is valid, listing the first 'limit' failing values otherwise.
+        """
+        failures = self.validate(rows)
+        if failures:
+            failing_rows = len({failure[0] for failure in failures})
+            details = '\n'.join(f'  row {index}: {field}={value!r}, expected {description}'
+                                for index, field, value, description in failures[:limit])
+            more = f'\n  ... {len(failures) - limit} more' if len(failures) > limit else ''
+            raise AssertionError(f'{len(failures)} invalid value(s) in {failing_rows}/{len(rows)} row(s):\n{details}{more}')
+
+
+EHR_APPOINTMENT_ROWS = RowValidator({
+    'uuid': length(36),
+    'appointmentId': length(7),
+    'patientId': pattern(r'\d+'),
+    'patientFirstName': min_length(1),
+    'patientBirthDate': pattern(r'\d{4}-\d{2}-\d{2}'),
+    'patientGender': pattern(r'[mfoMFO]'),
+    'appointmentStartTime': pattern(r'\d{2}:\d{2} [AP]M'),
+})
@@ -4,17 +4,18 @@ import json
 import pytest
 import requests
 
+from utils.config_parser import Config
 from utils.uploadscript import nrt_upload
 
 
 class S2THandler:
-    api_base_url = pytest.configs.get_config('api_base_url')
-    auth_url = pytest.configs.get_config('auth_url')
-    recording_url = pytest.configs.get_config('recording_url')
-    provider_email = pytest.configs.get_config('s2t_provider')
-    scribe_email = pytest.configs.get_config('s2t_scribe')
-    password = pytest.configs.get_config('password')
-    provider_id = pytest.configs.get_config('s2t_provider_id')
+    api_base_url = Config('api_base_url')
+    auth_url = Config('auth_url')
+    recording_url = Config('recording_url')
+    provider_email = Config('s2t_provider')
+    scribe_email = Config('s2t_scribe')
+    password = Config('password')
+    provider_id = Config('s2t_provider_id')
 
     @staticmethod
     def get_auth_token(username, password):
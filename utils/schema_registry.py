@@ -0,0 +1,70 @@
+import json
+import os
+import threading
+
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+
+from utils.app_constants import AppConstant
+
+
+class SchemaRegistry:
+    """
+    Loads every JSON schema file once per process and compiles it into a reusable validator, so that
+    validating a (large) response does not re-read the schema file & re-build the validator every time.
+    Schema paths may be absolute or relative to the project root, e.g.
+    'resources/json_data/ehr_appointments_schema.json'.
+    """
+
+    _validators = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_validator(cls, schema_path):
+        """
+        Return the compiled validator of the schema file, loading & checking the schema on first use.
+        :param schema_path: Path to the JSON schema file.
+        """
+        key = cls._resolve(schema_path)
+        validator = cls._validators.get(key)
+        if validator is None:
+            with cls._lock:
+                validator = cls._validators.get(key)
+                if validator is None:
+                    with open(key, 'r', encoding='UTF-8') as schema_file:
+                        schema = json.load(schema_file)
+                    validator_class = validator_for(schema)
+                    validator_class.check_schema(schema)
+                    validator = validator_class(schema)
+                    cls._validators[key] = validator
+        return validator
+
+    @classmethod
+    def get_schema(cls, schema_path):
+        """
+        Return the parsed schema of the schema file.
+        :param schema_path: Path to the JSON schema file.
+        """
+        return cls.get_validator(schema_path).schema
+
+    @classmethod
+    def validate(cls, instance, schema_path):
+        """
+        Drop-in replacement of jsonschema.validate taking a schema file path instead of a parsed schema.
+        :param instance: The JSON to validate.
+        :param schema_path: Path to the JSON schema file.
+        :raises ValidationError: the most relevant validation error if the instance is invalid.
+        """
+        error = best_match(cls.get_validator(schema_path).iter_errors(instance))
+        if error is not None:
+            raise error
+
+    @classmethod
+    def is_valid(cls, instance, schema_path):
+        return cls.get_validator(schema_path).is_valid(instance)
+
+    @staticmethod
+    def _resolve(schema_path):
+        if not os.path.isabs(schema_path):
+            schema_path = os.path.join(AppConstant.PROJECT_ROOT, schema_path)
+        return os.path.normpath(schema_path)
@@ -0,0 +1,70 @@
+import os
+import threading
+
+from cryptography.fernet import Fernet, InvalidToken
+
+
+class SecretStore:
+    """
+    Encrypted configs of the environment: variables named '<environment_variable_prefix><KEY>' holding a Fernet
+    token encrypted with the SECRET_KEY variable, e.g. AXGO_ALL_PROVIDER_PASSWORD -> 'all_provider_password'.
+    Only the variable names are scanned up front; a value is decrypted on its first read and kept in memory
+    (never in the loaded properties, so it can't be written back to a properties file), and each process
+    (e.g. xdist worker) only decrypts the secrets it actually uses.
+    """
+
+    def __init__(self, prefix, environ=None):
+        """
+        :param prefix: Prefix of the environment variables holding secrets
+        :param environ: Environment variables, os.environ by default
+        """
+        environ = os.environ if environ is None else environ
+        self.__encrypted = {name[len(prefix):].lower(): value for name, value in environ.items()
+                            if prefix and name.startswith(prefix)}
+        self.__secret_key = environ.get('SECRET_KEY')
+        self.__cipher = None
+        self.__decrypted = {}
+        self.__lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self.__encrypted
+
+    def __len__(self):
+        return len(self.__encrypted)
+
+    def __repr__(self):
+        return f'SecretStore({len(self)} secret(s))'
+
+    def keys(self):
+        return list(self.__encrypted)
+
+    def get(self, key):
+        """
+        :param key: Config key of the secret
+        :return: Decrypted value
+        """
+        value = self.__decrypted.get(key)
+        if value is None:
+            with self.__lock:
+                value = self.__decrypted.get(key)
+                if value is None:
+                    value = self.__decrypted[key] = self.__decrypt(key)
+        return value
+
+    def discard(self, key):
+        """
+        Forget a secret, e.g. once its config is explicitly overridden.
+        """
+        with self.__lock:
+            self.__encrypted.pop(key, None)
+            self.__decrypted.pop(key, None)
+
+    def __decrypt(self, key):
+        if self.__cipher is None:
+            if not self.__secret_key:
+                raise RuntimeError(f"SECRET_KEY environment variable is not set, '{key}' can't be decrypted.")
+            self.__cipher = Fernet(self.__secret_key)
+        try:
+            return self.__cipher.decrypt(self.__encrypted[key].encode()).decode()
+        except InvalidToken:
+            raise RuntimeError(f"'{key}' environment secret can't be decrypted with SECRET_KEY.") from None
@@ -0,0 +1,109 @@
+# pylint: disable=no-member
+import threading
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.latency_recorder import LatencyRecorder
+
+
+class SessionManager:
+    """
+    Keeps one keep-alive `requests.Session` per base URL so that every page object talking to the same
+    service (auth, ehr, appointments, transcript, audio continuity, graphql, ...) reuses warm connections
+    instead of opening a new TCP/TLS connection for each request. Pool sizes are read from the
+    'http_pool_connections', 'http_pool_maxsize' & 'http_pool_block' keys of the loaded configs.
+    """
+
+    DEFAULT_POOL_CONNECTIONS = 10
+    DEFAULT_POOL_MAXSIZE = 10
+
+    cassette = None
+    _sessions = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls, base_url):
+        """
+        Return the pooled session for the given base URL, creating it on first use.
+        :param base_url: Base URL of the API
+        :return: requests.Session shared by all callers of the same base URL
+        """
+        key = base_url.rstrip('/')
+        session = cls._sessions.get(key)
+        if session is None:
+            with cls._lock:
+                session = cls._sessions.get(key)
+                if session is None:
+                    session = cls._create_session()
+                    cls._sessions[key] = session
+        return session
+
+    @classmethod
+    def request(cls, request_type, base_url, request_path='', **kwargs):
+        """
+        Send a request through the pooled session of the given base URL, or through the cassette in
+        record/replay mode. The latency of every request is recorded by LatencyRecorder.
+        :param request_type: "GET", "POST", "PUT", "PATCH", "DELETE"
+        :param base_url: Base URL of the API
+        :param request_path: Path of the API endpoint
+        :param kwargs: Any other keyword argument accepted by `requests.Session.request`
+        :return: Response object
+        """
+        session = cls.get_session(base_url)
+        url = f'{base_url}/{request_path}'
+        start = LatencyRecorder.start()
+        try:
+            if cls.cassette:
+                response = cls.cassette.request(session, request_type, url, **kwargs)
+            else:
+                response = session.request(request_type, url, **kwargs)
+        except requests.RequestException:
+            LatencyRecorder.record(request_type, url, None, start)
+            raise
+        LatencyRecorder.record(request_type, url, response, start)
+        return response
+
+    @classmethod
+    def use_cassette(cls, cassette):
+        """
+        Record every request to / replay every request from the given cassette (None goes back to live mode).
+        :param cassette: utils.cassette.Cassette instance or None
+        """
+        cls.cassette = cassette
+
+    @classmethod
+    def close_all(cls):
+        """
+        Close every pooled session. Safe to call more than once.
+        """
+        with cls._lock:
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions.clear()
+
+    @classmethod
+    def _create_session(cls):
+        pool_connections = cls._get_int_config('http_pool_connections', cls.DEFAULT_POOL_CONNECTIONS)
+        pool_maxsize = cls._get_int_config('http_pool_maxsize', cls.DEFAULT_POOL_MAXSIZE)
+        pool_block = cls._get_config('http_pool_block', 'no') == 'yes'
+
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    @staticmethod
+    def _get_config(key, default=None):
+        configs = getattr(pytest, 'configs', None)
+        value = configs.get_config(key) if configs else None
+        return value if value else default
+
+    @classmethod
+    def _get_int_config(cls, key, default):
+        try:
+            return int(cls._get_config(key, default))
+        except ValueError:
+            return default
@@ -0,0 +1,146 @@
+"""
+Duration-aware test sharding. Historical per-test durations are merged from junit XML reports into
+'resources/test_durations.json'; the test classes (or modules) left after the '-m'/'-k' selection are then bin-packed (longest processing
+time first) into K shards of about the same total duration, so that K parallel Jenkins stages finish at the same time
+instead of waiting for the slowest test file. Tests without history are estimated with the median duration.
+
+Every shard computes the same plan from the same collection & durations, so the shards are disjoint and
+together run every test exactly once.
+
+Usage (after a run, to update the durations):
+    python -m utils.sharding -junit testResults/testcases/*.xml
+"""
+import argparse
+import heapq
+import json
+import os
+import statistics
+import xml.etree.ElementTree as ElementTree
+
+from utils.app_constants import AppConstant
+
+DEFAULT_DURATION = 1.0
+SMOOTHING = 0.5  # weight of the latest run in the stored duration
+
+
+def junit_key(nodeid):
+    """
+    Convert a pytest node ID to the 'classname.name' key of the junit XML report, e.g.
+    'testcases/test_appointments.py::TestAppointments::test_x[1]' -> 'testcases.test_appointments.TestAppointments.test_x[1]'.
+    """
+    path, _, name = nodeid.partition('::')
+    module = path[:-3] if path.endswith('.py') else path
+    return '.'.join([module.replace('/', '.').replace('\\', '.')] + name.split('::'))
+
+
+class DurationStore:
+
+    def __init__(self, path=AppConstant.TEST_DURATIONS_FILE):
+        """
+        :param path: JSON file of the historical durations, in seconds per junit key
+        """
+        self.path = path
+        self.durations = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='UTF-8') as durations_file:
+                self.durations = json.load(durations_file)
+
+    def update_from_junit(self, *junit_paths):
+        """
+        Merge the test durations of junit XML reports, smoothing them with the stored ones.
+        :param junit_paths: junit XML report files
+        :return: Number of merged test cases
+        """
+        merged = 0
+        for junit_path in junit_paths:
+            for testcase in ElementTree.parse(junit_path).iter('testcase'):
+                if testcase.find('skipped') is not None:
+                    continue
+                key = f"{testcase.get('classname')}.{testcase.get('name')}"
+                duration = float(testcase.get('time') or 0)
+                previous = self.durations.get(key)
+                self.durations[key] = duration if previous is None else \
+                    round(previous * (1 - SMOOTHING) + duration * SMOOTHING, 3)
+                merged += 1
+        return merged
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'w', encoding='UTF-8') as durations_file:
+            json.dump(self.durations, durations_file, indent=4, sort_keys=True)
+
+    def estimate(self, nodeids):
+        """
+        Return the expected duration of every node ID, the median of the known ones for unknown tests.
+        """
+        known = [self.durations[junit_key(nodeid)] for nodeid in nodeids if junit_key(nodeid) in self.durations]
+        default = statistics.median(known) if known else DEFAULT_DURATION
+        return [self.durations.get(junit_key(nodeid), default) for nodeid in nodeids]
+
+
+def plan_shards(nodeids, durations, shard_count):
+    """
+    Assign every test to a shard, longest tests first, each one to the currently least loaded shard.
+    :param nodeids: Collected node IDs
+    :param durations: Expected duration of each node ID
+    :param shard_count: Number of shards
+    :return: Shard index of each node ID
+    """
+    shards = [(0.0, shard_index) for shard_index in range(shard_count)]
+    assignment = [0] * len(nodeids)
+    for index in sorted(range(len(nodeids)), key=lambda i: (-durations[i], nodeids[i])):
+        load, shard_index = heapq.heappop(shards)
+        assignment[index] = shard_index
+        heapq.heappush(shards, (load + durations[index], shard_index))
+    return assignment
+
+
+def scope_key(nodeid):
+    """
+    Class (or module, for module level tests) of a test, e.g.
+    'testcases/test_appointments.py::TestAppointments::test_x[1]' -> 'testcases/test_appointments.py::TestAppointments'.
+    Tests of the same class are kept in the same shard, so its setup_class runs only once.
+    """
+    path, _, name = nodeid.partition('::')
+    parts = name.split('::')
+    return '::'.join([path] + parts[:-1])
+
+
+def select_shard(items, shard_index, shard_count, durations_path=AppConstant.TEST_DURATIONS_FILE):
+    """
+    Split the collected items into the ones of the given shard and the other ones, keeping their order. Whole
+    classes (or modules) are bin-packed into the shards.
+    :return: (selected items, deselected items, expected duration of the shard)
+    """
+    nodeids = [item.nodeid for item in items]
+    durations = DurationStore(durations_path).estimate(nodeids)
+
+    scope_durations = {}
+    for nodeid, duration in zip(nodeids, durations):
+        scope = scope_key(nodeid)
+        scope_durations[scope] = scope_durations.get(scope, 0.0) + duration
+    scopes = list(scope_durations)
+    shard_of_scope = dict(zip(scopes, plan_shards(scopes, [scope_durations[scope] for scope in scopes], shard_count)))
+
+    selected, deselected = [], []
+    for item in items:
+        (selected if shard_of_scope[scope_key(item.nodeid)] == shard_index else deselected).append(item)
+    expected = sum(duration for scope, duration in scope_durations.items() if shard_of_scope[scope] == shard_index)
+    return selected, deselected, expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge junit XML test durations into the sharding history.')
+    parser.add_argument("-junit", "--junit", dest="junit_paths", nargs='+', required=True, help="junit XML report files.")
+    parser.add_argument("-durations", "--durations", dest="durations_path", default=AppConstant.TEST_DURATIONS_FILE,
+                        help="Durations JSON file to update.")
+    args = parser.parse_args()
+
+    store = DurationStore(args.durations_path)
+    merged = store.update_from_junit(*args.junit_paths)
+    store.save()
+    print(f'{merged} test duration(s) merged into {args.durations_path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -25,6 +25,9 @@ class APIClient:
         if not base_url.endswith('/'):
             base_url += '/'
         self.__url = base_url + f'index.php?/api/v{version}/'
+        # Pooled keep-alive connections, shared by every request of the client.
+        self.__session = requests.Session()
+        self.__auth = None
 
     def send_get(self, uri, filepath=None):
         """Issue a GET request (read) against the API.
@@ -56,26 +59,20 @@ class APIClient:
     def __send_request(self, method, uri, data):
         url = self.__url + uri
 
-        auth = str(
-            base64.b64encode(
-                bytes('%s:%s' % (self.user, self.password), 'utf-8')
-            ),
-            'ascii'
-        ).strip()
-        headers = {'Authorization': 'Basic ' + auth}
+        headers = {'Authorization': self.__get_auth_header()}
 
         if method == 'POST':
             if uri[:14] == 'add_attachment':    # add_attachment API method
                 files = {'attachment': (open(data, 'rb'))}
-                response = requests.post(url, headers=headers, files=files)
+                response = self.__session.post(url, headers=headers, files=files)
                 files['attachment'].close()
             else:
                 headers['Content-Type'] = 'application/json'
                 payload = bytes(json.dumps(data), 'utf-8')
-                response = requests.post(url, headers=headers, data=payload)
+                response = self.__session.post(url, headers=headers, data=payload)
         else:
             headers['Content-Type'] = 'application/json'
-            response = requests.get(url, headers=headers)
+            response = self.__session.get(url, headers=headers)
 
         if response.status_code > 201:
             try:
@@ -97,6 +94,21 @@ class APIClient:
                 except:  # Nothing to return
                     return {}
 
+    def __get_auth_header(self):
+        # Built once per credentials, not on every request.
+        if self.__auth is None or self.__auth[0] != (self.user, self.password):
+            auth = str(
+                base64.b64encode(
+                    bytes('%s:%s' % (self.user, self.password), 'utf-8')
+                ),
+                'ascii'
+            ).strip()
+            self.__auth = ((self.user, self.password), 'Basic ' + auth)
+        return self.__auth[1]
+
+    def close(self):
+        self.__session.close()
+
 
 class APIError(Exception):
     pass
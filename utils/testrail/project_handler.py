@@ -1,3 +1,6 @@
+from utils.testrail.run_index import RunIndex
+
+
 class ProjectHandler:
 
     def __init__(self, session):
@@ -8,7 +11,6 @@ class ProjectHandler:
 
     def get_project_by_name(self, project_name):
         projects = self.get_all_projects()
-        print(projects)
 
         for project in projects:
             extracted_project_name = project['name']
@@ -16,8 +18,7 @@ class ProjectHandler:
                 return project
 
     def get_project_id(self, project_name):
-        project = self.get_project_by_name(project_name)
-        return project['id']
+        return RunIndex.get_project_id(self.session, project_name)
 
     def get_all_projects(self):
-        return self.session.send_get('get_projects')['projects']
+        return RunIndex.get_all_pages(self.session, 'get_projects', 'projects')
@@ -0,0 +1,117 @@
+import queue
+import threading
+
+from utils.testrail.testresult_handler import TestResultHandler
+from utils.testrail.testrun_handler import TestRunHandler
+
+STATUS_PASSED = 1
+STATUS_BLOCKED = 2
+STATUS_FAILED = 5
+
+
+class RunNotFoundError(LookupError):
+    """
+    Raised when the project has no open test run of the reporter's name.
+    """
+
+
+class TestRailReporter:
+    """
+    Buffered TestRail reporter. Results are queued by the tests and posted by a background thread through
+    'add_results_for_cases', in batches of 'batch_size' results or every 'flush_interval' seconds, so that
+    reporting never adds a TestRail round-trip to a test. The project & run IDs are resolved only once; if
+    there is no open run of that name, reporting stops for the session (see 'error').
+    """
+
+    __test__ = False
+
+    def __init__(self, session, project_name, run_name, batch_size=50, flush_interval=5.0):
+        """
+        :param session: APIClient returned by UserSessionManager.get_session
+        :param project_name: Name of the TestRail project
+        :param run_name: Name of the test run of the project the results are added to
+        :param batch_size: Maximum number of results posted per request
+        :param flush_interval: Maximum number of seconds a result waits in the queue
+        """
+        self.session = session
+        self.project_name = project_name
+        self.run_name = run_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.errors = []
+        self.error = None
+        self.__run_id = None
+        self.__results = queue.Queue()
+        self.__closed = threading.Event()
+        self.__batch_ready = threading.Event()
+        self.__worker = threading.Thread(target=self.__flush_periodically, name='testrail-reporter', daemon=True)
+        self.__worker.start()
+
+    @property
+    def run_id(self):
+        if self.__run_id is None:
+            test_runs = TestRunHandler(self.session).get_testruns_by_name(self.project_name, self.run_name)
+            self.__run_id = next((test_run['id'] for test_run in test_runs if not test_run['is_completed']), None)
+            if self.__run_id is None:
+                raise RunNotFoundError(f"No open TestRail run named '{self.run_name}' in project '{self.project_name}'.")
+        return self.__run_id
+
+    def add_result(self, case_id, status_id, comment='', elapsed=None):
+        """
+        Queue the result of a test case, without any request.
+        :param case_id: TestRail case ID, with or without the 'C' prefix
+        :param status_id: TestRail status ID, e.g. STATUS_PASSED or STATUS_FAILED
+        :param comment: Comment of the result, e.g. the failure
+        :param elapsed: Duration of the test in seconds
+        """
+        if self.error:
+            return
+        result = {'case_id': int(str(case_id).lstrip('Cc')), 'status_id': status_id, 'comment': comment}
+        if elapsed:
+            result['elapsed'] = f'{max(round(elapsed), 1)}s'
+        self.__results.put(result)
+        if self.__results.qsize() >= self.batch_size:
+            self.__batch_ready.set()
+
+    def flush(self):
+        """
+        Post every queued result, 'batch_size' results per request.
+        """
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.__results.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            if self.error:
+                self.errors.append((batch, self.error))
+                continue
+            try:
+                TestResultHandler(self.session).add_results_for_cases(self.run_id, batch)
+            except RunNotFoundError as error:
+                # No run to report to: stop reporting instead of looking the run up again for every batch.
+                self.error = error
+                self.errors.append((batch, error))
+                print(f'TestRail reporting stopped: {error}')
+            except Exception as error:  # pylint: disable=broad-except
+                # Reporting must never fail the run; the lost results are listed at the end.
+                self.errors.append((batch, error))
+                print(f'{len(batch)} TestRail result(s) could not be posted: {error}')
+
+    def close(self):
+        """
+        Stop the background thread and post the remaining results.
+        """
+        self.__closed.set()
+        self.__batch_ready.set()
+        self.__worker.join()
+        self.flush()
+
+    def __flush_periodically(self):
+        while not self.__closed.is_set():
+            self.__batch_ready.wait(self.flush_interval)
+            self.__batch_ready.clear()
+            self.flush()
@@ -0,0 +1,114 @@
+import threading
+
+
+class RunIndex:
+    """
+    Process-wide index of the TestRail projects (name -> ID) & test runs of each project (name -> runs with
+    their completion status), so that run lookups by name are dictionary lookups instead of scans of the whole
+    run history. The runs of a project are fetched page by page once; afterwards only the runs created after
+    the newest indexed one are fetched ('created_after'), and the runs closed/deleted through TestRunHandler
+    are updated in place. Runs closed outside this process are only seen after clear().
+    """
+
+    PAGE_SIZE = 250
+
+    _project_ids = {}
+    _runs = {}
+    _created_after = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_project_id(cls, session, project_name):
+        """
+        :param session: APIClient returned by UserSessionManager.get_session
+        :param project_name: Name of the TestRail project
+        :return: ID of the project, or None if there is no such project
+        """
+        with cls._lock:
+            if project_name not in cls._project_ids:
+                for project in cls.get_all_pages(session, 'get_projects', 'projects'):
+                    cls._project_ids.setdefault(project['name'], project['id'])
+            return cls._project_ids.get(project_name)
+
+    @classmethod
+    def get_runs(cls, session, project_id, run_name):
+        """
+        Return the runs of the project with the given name, newest first, after fetching the new runs.
+        :param session: APIClient returned by UserSessionManager.get_session
+        :param project_id: ID of the TestRail project
+        :param run_name: Name of the test runs
+        :return: List of {'id', 'name', 'is_completed', 'created_on'} dictionaries
+        """
+        with cls._lock:
+            cls._refresh(session, project_id)
+            return list(cls._runs[project_id].get(run_name, []))
+
+    @classmethod
+    def add_run(cls, project_id, run):
+        with cls._lock:
+            if project_id in cls._runs:
+                cls._index_run(project_id, run)
+
+    @classmethod
+    def mark_completed(cls, run_id):
+        with cls._lock:
+            for run in cls._find_run(run_id):
+                run['is_completed'] = True
+
+    @classmethod
+    def remove_run(cls, run_id):
+        with cls._lock:
+            for runs_by_name in cls._runs.values():
+                for name, runs in runs_by_name.items():
+                    runs_by_name[name] = [run for run in runs if run['id'] != run_id]
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._project_ids.clear()
+            cls._runs.clear()
+            cls._created_after.clear()
+
+    @classmethod
+    def get_all_pages(cls, session, uri, key, limit=PAGE_SIZE):
+        """
+        Fetch every page of a paginated TestRail list, e.g. get_runs/1 -> 'runs'.
+        :param session: APIClient returned by UserSessionManager.get_session
+        :param uri: API method, including its filters
+        :param key: Key of the entities in a page
+        :param limit: Number of entities per page
+        """
+        entities, offset = [], 0
+        while True:
+            page = session.send_get(f'{uri}&limit={limit}&offset={offset}')
+            if isinstance(page, list):
+                # TestRail before 6.7 returns the whole unpaginated list.
+                return page
+            entities.extend(page[key])
+            if not page.get('_links', {}).get('next') or len(page[key]) < limit:
+                return entities
+            offset += len(page[key])
+
+    @classmethod
+    def _refresh(cls, session, project_id):
+        uri = f'get_runs/{project_id}'
+        if project_id in cls._created_after:
+            # Runs created in the same second as the newest indexed one are fetched again & skipped below.
+            uri += f'&created_after={cls._created_after[project_id] - 1}'
+        cls._runs.setdefault(project_id, {})
+        for run in cls.get_all_pages(session, uri, 'runs'):
+            cls._index_run(project_id, run)
+
+    @classmethod
+    def _index_run(cls, project_id, run):
+        runs = cls._runs[project_id].setdefault(run['name'], [])
+        if any(indexed['id'] == run['id'] for indexed in runs):
+            return
+        runs.append({key: run.get(key) for key in ('id', 'name', 'is_completed', 'created_on')})
+        runs.sort(key=lambda indexed: (indexed['created_on'] or 0, indexed['id']), reverse=True)
+        cls._created_after[project_id] = max(cls._created_after.get(project_id, 0), run.get('created_on') or 0)
+
+    @classmethod
+    def _find_run(cls, run_id):
+        return [run for runs_by_name in cls._runs.values() for runs in runs_by_name.values()
+                for run in runs if run['id'] == run_id]
@@ -10,6 +10,14 @@ class TestResultHandler:
         self.session.send_post(
             f'add_result_for_case/{run_id}/{case_id}', request_body)
 
+    def add_results_for_cases(self, run_id, results):
+        """
+        Add the results of several test cases of a run in a single request.
+        :param run_id: ID of the test run
+        :param results: List of result dictionaries, each with a 'case_id' & a 'status_id'
+        """
+        return self.session.send_post(f'add_results_for_cases/{run_id}', {'results': results})
+
     def add_result_for_case_by_run_name(self, project_name, run_name, case_id, request_body={}):
         run_id = TestRunHandler(self.session).get_testrun_id(
             project_name, run_name)
@@ -1,9 +1,11 @@
 from utils.testrail.project_handler import ProjectHandler
+from utils.testrail.run_index import RunIndex
 
 
 class TestRunHandler:
     """
-    This class deals with creating, displaying, updating or deleting test runs in TestRail.
+    This class deals with creating, displaying, updating or deleting test runs in TestRail. Runs are looked up
+    by name through the process-wide RunIndex.
     """
 
     def __init__(self, session):
@@ -26,7 +28,9 @@ class TestRunHandler:
                 suite_id : int (mandatory)
         """
         try:
-            self.session.send_post(f'add_run/{project_id}', data)
+            test_run = self.session.send_post(f'add_run/{project_id}', data)
+            RunIndex.add_run(project_id, test_run)
+            return test_run
         except Exception as ex:
             print(f'Error occured during adding testrun!! {str(ex)}')
 
@@ -35,49 +39,46 @@ class TestRunHandler:
         self.add_testrun_by_project_id(project_id, data)
 
     def get_all_runs_by_project_id(self, project_id):
-        return self.session.send_get(f'get_runs/{project_id}')
+        return {'runs': RunIndex.get_all_pages(self.session, f'get_runs/{project_id}', 'runs')}
 
     def get_all_runs_by_project_name(self, project_name):
-        project_id = ProjectHandler(self.session).get_project_by_name(project_name)['id']
-        print(f'Porject ID: {project_id}')
+        project_id = ProjectHandler(self.session).get_project_id(project_name)
         return self.get_all_runs_by_project_id(project_id)['runs']
 
+    def get_testruns_by_name(self, project_name, run_name):
+        """
+        Return the runs of the project with the given name, newest first.
+        """
+        project_id = ProjectHandler(self.session).get_project_id(project_name)
+        return RunIndex.get_runs(self.session, project_id, run_name)
+
     def get_testrun_id(self, project_name, run_name):
-        test_runs = self.get_all_runs_by_project_name(project_name)
-        for test_run in test_runs:
-            extracted_name = test_run['name']
-            if extracted_name == run_name:
-                return test_run['id']
+        test_runs = self.get_testruns_by_name(project_name, run_name)
+        if test_runs:
+            return test_runs[0]['id']
 
     def close_testrun_by_id(self, run_id, data={}):
         self.session.send_post(f'close_run/{run_id}', data)
+        RunIndex.mark_completed(run_id)
 
     def close_testrun_by_name(self, project_name, run_name, data={}):
         run_id = self.get_testrun_id(project_name, run_name)
         self.close_testrun_by_id(run_id)
 
     def close_all_testruns_by_name(self, project_name, run_name):
-        test_runs = self.get_all_runs_by_project_name(project_name)
-
-        for test_run in test_runs:
-            testrun_name = test_run['name']
-            testrun_status = test_run['is_completed']
-
-            if testrun_name == run_name and not testrun_status:
+        for test_run in self.get_testruns_by_name(project_name, run_name):
+            if not test_run['is_completed']:
                 self.close_testrun_by_id(test_run['id'])
 
     def delete_testrun_by_id(self, run_id, data={}):
         self.session.send_post(f'delete_run/{run_id}', data)
+        RunIndex.remove_run(run_id)
 
     def delete_testrun_by_name(self, project_name, run_name, data={}):
         run_id = self.get_testrun_id(project_name, run_name)
         self.delete_testrun_by_id(run_id)
 
     def delete_all_testruns_by_name(self, project_name, run_name):
-        test_runs = self.get_all_runs_by_project_name(project_name)
-
-        for test_run in test_runs:
-            testrun_name = test_run['name']
-            testrun_status = test_run['is_completed']
-            if testrun_name == run_name and not testrun_status:
+        for test_run in self.get_testruns_by_name(project_name, run_name):
+            if not test_run['is_completed']:
                 self.delete_testrun_by_id(test_run['id'])
@@ -0,0 +1,97 @@
+# pylint: disable=no-member
+import threading
+import time
+
+import jwt
+import pytest
+from jwt import DecodeError
+
+
+class TokenCache:
+    """
+    Process-wide cache of auth tokens keyed by (auth_base_url, username, password). A cached token is
+    handed out until it is about to expire (JWT 'exp' claim minus the 'auth_token_refresh_margin' config
+    value in seconds), after which it is fetched again. A lock is held per key so that concurrent callers
+    asking for the same credentials trigger only one login round-trip.
+    """
+
+    DEFAULT_REFRESH_MARGIN = 60
+
+    _tokens = {}
+    _key_locks = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_token(cls, key, fetch_token):
+        """
+        Return a cached, still valid token for the key or fetch (and cache) a new one.
+        :param key: (auth_base_url, username, password) tuple
+        :param fetch_token: Callable without arguments returning a fresh token
+        :return: Authentication token
+        """
+        token = cls._get_fresh_token(key)
+        if token:
+            return token
+
+        with cls._get_key_lock(key):
+            # Another caller may have refreshed the token while we were waiting for the lock.
+            token = cls._get_fresh_token(key)
+            if token:
+                return token
+
+            token = fetch_token()
+            try:
+                expires_at = cls.get_expiry(token)
+            except DecodeError:
+                # Not a JWT (e.g. 'Token Not Found'), never cache failed logins.
+                return token
+
+            cls._tokens[key] = (token, expires_at)
+            return token
+
+    @classmethod
+    def invalidate(cls, user_name=None):
+        """
+        Drop cached tokens of the given user or every cached token if no user is specified. Needed once a
+        token is revoked on the server side, e.g. after blocking a user or resetting the password.
+        :param user_name: Username whose tokens should be dropped
+        """
+        with cls._lock:
+            for key in list(cls._tokens):
+                if user_name is None or key[1] == user_name:
+                    del cls._tokens[key]
+
+    @staticmethod
+    def get_expiry(token):
+        """
+        Read the 'exp' claim of a JWT without verifying its signature.
+        :param token: JWT token
+        :return: Expiry as epoch seconds or None if the token never expires
+        """
+        decoded = jwt.decode(token, options={"verify_signature": False})
+        return decoded.get('exp')
+
+    @classmethod
+    def _get_fresh_token(cls, key):
+        entry = cls._tokens.get(key)
+        if entry is None:
+            return None
+
+        token, expires_at = entry
+        if expires_at is not None and time.time() >= expires_at - cls._get_refresh_margin():
+            return None
+        return token
+
+    @classmethod
+    def _get_key_lock(cls, key):
+        with cls._lock:
+            return cls._key_locks.setdefault(key, threading.Lock())
+
+    @classmethod
+    def _get_refresh_margin(cls):
+        configs = getattr(pytest, 'configs', None)
+        value = configs.get_config('auth_token_refresh_margin') if configs else None
+        try:
+            return int(value) if value else cls.DEFAULT_REFRESH_MARGIN
+        except ValueError:
+            return cls.DEFAULT_REFRESH_MARGIN
@@ -0,0 +1,196 @@
+"""
+Load generator for the NRT/MCU file upload server. Simulates N providers uploading recordings at the
+same time, each one running the full start -> chunk(s) -> stop -> streamuploadcompletion sequence of
+'upload_nrt_file', and reports per signal endpoint latency percentiles together with the overall throughput.
+
+Usage:
+    python -m utils.upload_go_audio.load_generator -url https://mcu-test1.augmedix.com:30010 \
+        -token <jwt> -file utils/upload_go_audio/medium_length7mnt.mp4 -providers 10 -streams 50 -rate 2
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+import requests
+
+from utils.latency_stats import summarize
+from utils.upload_go_audio.nrt_core import (DEFAULT_CHUNK_SIZE, chunk_duration_ns, create_chunk_payload,
+                                            create_completion_signal, create_start_signal, create_stop_signal,
+                                            iter_file_chunks, media_ns_per_byte)
+
+
+class NRTLoadGenerator:
+
+    def __init__(self, server_url, jwt_token, file_path, providers=4, streams=None, arrival_rate=1.0,
+                 chunk_size=DEFAULT_CHUNK_SIZE, stream_type='visit', media_type='audio', note_ids=None):
+        """
+        :param server_url: NRT/MCU server URL
+        :param jwt_token: Auth token of the provider the streams are uploaded for
+        :param file_path: Media file uploaded by every simulated provider
+        :param providers: Number of providers uploading concurrently
+        :param streams: Total number of streams to upload, one per provider if None
+        :param arrival_rate: Mean number of new streams started per second (Poisson arrivals), 0 starts all at once
+        :param chunk_size: Bytes of media sent per '/chunk' request, 0 to send the whole file in one request.
+                           The byte slices aren't decodable media on their own: they load the upload path only
+        :param stream_type: recording/visit/dictation
+        :param media_type: audio/video
+        :param note_ids: Note IDs the streams are attached to (used round robin), random IDs if None
+        """
+        self.server_url = server_url.rstrip('/')
+        self.jwt_token = jwt_token
+        self.file_path = file_path
+        self.providers = providers
+        self.streams = streams or providers
+        self.arrival_rate = arrival_rate
+        self.chunk_size = chunk_size
+        self.stream_type = stream_type
+        self.media_type = media_type
+        self.note_ids = note_ids
+        self.ns_per_byte = media_ns_per_byte(file_path)
+
+        decoded = jwt.decode(jwt_token, options={"verify_signature": False})
+        self.doc_id = str(decoded.get('guid') or decoded.get('uid'))
+
+        self.samples = {}
+        self.failed_streams = 0
+        self.media_bytes_sent = 0
+        self.payload_bytes_sent = 0
+        self._lock = threading.Lock()
+        self._thread_data = threading.local()
+
+    def run(self):
+        """
+        Upload all the streams and return the report (see build_report).
+        """
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.providers) as executor:
+            futures = []
+            for index in range(self.streams):
+                futures.append(executor.submit(self.upload_stream, index))
+                if self.arrival_rate and index < self.streams - 1:
+                    time.sleep(random.expovariate(self.arrival_rate))
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+        return self.build_report(elapsed)
+
+    def upload_stream(self, index):
+        """
+        Run the full signal sequence of one stream. Returns True if every signal was accepted.
+        """
+        note_id = str(self.note_ids[index % len(self.note_ids)]) if self.note_ids else str(uuid.uuid4())
+        stream_id = self.doc_id + '-' + note_id + '-' + str(uuid.uuid4())
+
+        start_signal = create_start_signal(stream_id, self.doc_id, note_id, self.stream_type, self.media_type)
+        success = self.send_timed_signal('/command', start_signal, 'start')
+
+        last_chunk_id = 0
+        if success:
+            for sequence_number, chunk_bytes in iter_file_chunks(self.file_path, self.chunk_size):
+                chunk_signal = create_chunk_payload(chunk_bytes, stream_id, self.stream_type, sequence_number,
+                                                    chunk_duration_ns(len(chunk_bytes), self.ns_per_byte))
+                success = self.send_timed_signal('/chunk', chunk_signal, media_bytes=len(chunk_bytes))
+                if not success:
+                    break
+                last_chunk_id = sequence_number
+
+        if success:
+            stop_signal = create_stop_signal(stream_id, self.doc_id, note_id, self.stream_type, self.media_type,
+                                             last_chunk_id)
+            success = self.send_timed_signal('/command', stop_signal, 'stop')
+
+        if success:
+            completion_signal = create_completion_signal(stream_id)
+            success = self.send_timed_signal('/streamuploadcompletion', completion_signal)
+
+        if not success:
+            with self._lock:
+                self.failed_streams += 1
+        return success
+
+    def send_timed_signal(self, end_point, payload, signal_name=None, media_bytes=0):
+        """
+        Send a signal through the calling thread's keep-alive session and record its latency.
+        """
+        session = getattr(self._thread_data, 'session', None)
+        if session is None:
+            session = self._thread_data.session = requests.Session()
+
+        headers = {'Content-type': 'application/json',
+                   'Accept': 'text/plain',
+                   'Authorization': 'Bearer ' + self.jwt_token}
+
+        start = time.perf_counter()
+        try:
+            ok = session.post(self.server_url + end_point, data=payload, headers=headers).ok
+        except requests.RequestException as error:
+            print(f'{end_point} signal sending error: {error}')
+            ok = False
+        latency = time.perf_counter() - start
+
+        sample_name = f'{end_point}:{signal_name}' if signal_name else end_point
+        with self._lock:
+            self.samples.setdefault(sample_name, []).append((latency, ok))
+            if ok:
+                self.media_bytes_sent += media_bytes
+                self.payload_bytes_sent += len(payload)
+        return ok
+
+    def build_report(self, elapsed):
+        """
+        Aggregate the recorded samples: latency percentiles (ms) & error count per signal endpoint plus the
+        overall throughput in MB/s (media bytes & actual request payload bytes).
+        """
+        endpoints = {}
+        for sample_name, samples in self.samples.items():
+            summary = summarize([latency * 1000 for latency, _ in samples], percentiles=(50, 95, 99))
+            summary['errors'] = sum(1 for _, ok in samples if not ok)
+            endpoints[sample_name] = summary
+
+        megabyte = 1024 * 1024
+        return {
+            'providers': self.providers,
+            'streams': self.streams,
+            'failed_streams': self.failed_streams,
+            'elapsed_seconds': elapsed,
+            'media_mb_sent': self.media_bytes_sent / megabyte,
+            'media_throughput_mb_per_sec': self.media_bytes_sent / megabyte / elapsed if elapsed else 0,
+            'payload_throughput_mb_per_sec': self.payload_bytes_sent / megabyte / elapsed if elapsed else 0,
+            'endpoints_latency_ms': endpoints,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel multi-stream NRT upload load generator.')
+    parser.add_argument("-url", "--serverurl", dest="server_url", help="NRT Server URL. i.e. https://mcu-test1.augmedix.com:30010", required=True)
+    parser.add_argument("-token", "--token", dest="token", help="Provider's JWT auth token.", required=True)
+    parser.add_argument("-file", "--filepath", dest="file_path", help="file path of local media.", required=True)
+    parser.add_argument("-providers", "--providers", dest="providers", type=int, default=4, help="Number of concurrent providers.")
+    parser.add_argument("-streams", "--streams", dest="streams", type=int, help="Total number of streams, one per provider by default.")
+    parser.add_argument("-rate", "--arrival-rate", dest="arrival_rate", type=float, default=1.0, help="Mean new streams per second, 0 to start all at once.")
+    parser.add_argument("-chunk", "--chunk-size", dest="chunk_size", type=int, default=DEFAULT_CHUNK_SIZE, help="Bytes of media per chunk, 0 (default) sends the whole file in one request.")
+    parser.add_argument("-stype", "--streamingtype", dest="stream_type", default='visit', help="streaming type. i.e. recording/visit/dictation")
+    parser.add_argument("-mtype", "--mediatype", dest="media_type", default='audio', help="media type. i.e. audio/video")
+    parser.add_argument("-notes", "--note-ids", dest="note_ids", nargs='*', help="Note IDs to attach the streams to.")
+    parser.add_argument("-report", "--report", dest="report", help="Write the JSON report to this file as well.")
+    args = parser.parse_args()
+
+    report = NRTLoadGenerator(args.server_url, args.token, args.file_path, providers=args.providers,
+                              streams=args.streams, arrival_rate=args.arrival_rate, chunk_size=args.chunk_size,
+                              stream_type=args.stream_type, media_type=args.media_type,
+                              note_ids=args.note_ids).run()
+
+    print(json.dumps(report, indent=4))
+    if args.report:
+        with open(args.report, 'w', encoding='UTF-8') as report_file:
+            json.dump(report, report_file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,13 @@
 import requests
 import json
-import base64
 import datetime
 import uuid
 
+# The chunking helpers are shared with the standalone upload script.
+from utils.uploadscript.nrt_core import (DEFAULT_CHUNK_DURATION, DEFAULT_CHUNK_SIZE, chunk_duration_ns,  # pylint: disable=unused-import
+                                         create_chunk_payload, create_chunk_signal, iter_file_chunks,
+                                         media_ns_per_byte, mp4_duration_ns, send_chunks)
+
 
 def timestamp_millisec64():
     return int((datetime.datetime.utcnow() - datetime.datetime(1970, 1, 1)).total_seconds() * 1000)
@@ -24,7 +28,7 @@ def create_start_signal(stream_id, doc_id, note_id, stream_type, media_type):
     return start_payload
 
 
-def create_stop_signal(stream_id, doc_id, note_id, stream_type, media_type):
+def create_stop_signal(stream_id, doc_id, note_id, stream_type, media_type, last_chunk_id=1):
     stop = {
         'name': "stop",
         'streamId':  stream_id,
@@ -34,7 +38,7 @@ def create_stop_signal(stream_id, doc_id, note_id, stream_type, media_type):
         'starttime': timestamp_millisec64(),
         'mediatype': media_type,
         'sessionDuration': 50000,
-        'lastChunkId': 1,
+        'lastChunkId': last_chunk_id,
         'endtime': timestamp_millisec64()
     }
 
@@ -42,25 +46,6 @@ def create_stop_signal(stream_id, doc_id, note_id, stream_type, media_type):
     return stop_payload
 
 
-def create_chunk_signal(file_path, stream_id, stream_type):
-    with open(file_path, "rb") as image_file:
-        encoded_file = base64.b64encode(image_file.read())
-
-    chunk = {
-        'retentionDuration' : 604800000000000,
-        'streamId' : stream_id,
-        'type' : stream_type,
-        'fileName' : "0000001.mp4",
-        'sequenceNumber' : 1,
-        'initTime' : timestamp_millisec64(),
-        'chunkDuration' : 5000000000,
-        'file': encoded_file.decode("utf-8")
-    }
-
-    chunk_payload = json.dumps(chunk)
-    return chunk_payload
-
-
 def create_completion_signal(stream_id):
     chunk = {
         "streamId": stream_id,
@@ -72,12 +57,12 @@ def create_completion_signal(stream_id):
     return chunk_payload
 
 
-def send_signal(jwt_token, server_url, end_point, payload):
+def send_signal(jwt_token, server_url, end_point, payload, session=None):
     headers = {'Content-type': 'application/json',
                'Accept': 'text/plain',
                'Authorization': 'Bearer ' + jwt_token}
 
-    response = requests.post(server_url+end_point, data=payload, headers=headers)
+    response = (session or requests).post(server_url+end_point, data=payload, headers=headers)
     if response.ok:
         print(end_point + " signal sent", len(payload))
     else:
@@ -86,29 +71,29 @@ def send_signal(jwt_token, server_url, end_point, payload):
     return response
 
 
-def upload_nrt_file(server_url, doc_id, note_id, stream_type, media_type, file_path, jwt_token):
+def upload_nrt_file(server_url, doc_id, note_id, stream_type, media_type, file_path, jwt_token, chunk_size=DEFAULT_CHUNK_SIZE):
     unique_id = str(uuid.uuid4())
     stream_id = doc_id + '-' + note_id + '-' + unique_id
     print('stream_id', stream_id)
 
-    start_signal = create_start_signal(stream_id, doc_id, note_id, stream_type, media_type)
-    resp = send_signal(jwt_token, server_url, '/command', start_signal)
-    if not resp.ok:
-        return False
-
-    chunk_signal = create_chunk_signal(file_path, stream_id, stream_type)
-    resp = send_signal(jwt_token, server_url, '/chunk', chunk_signal)
-    if not resp.ok:
-        return False
-
-    stop_signal = create_stop_signal(stream_id, doc_id, note_id, stream_type, media_type)
-    resp = send_signal(jwt_token, server_url, '/command', stop_signal)
-    if not resp.ok:
-        return False
-
-    completion_signal = create_completion_signal(stream_id)
-    resp = send_signal(jwt_token, server_url, '/streamuploadcompletion', completion_signal)
-    if not resp.ok:
-        return False
+    with requests.Session() as session:
+        start_signal = create_start_signal(stream_id, doc_id, note_id, stream_type, media_type)
+        resp = send_signal(jwt_token, server_url, '/command', start_signal, session)
+        if not resp.ok:
+            return False, stream_id
+
+        last_chunk_id = send_chunks(jwt_token, server_url, file_path, stream_id, stream_type, chunk_size, session)
+        if last_chunk_id is None:
+            return False, stream_id
+
+        stop_signal = create_stop_signal(stream_id, doc_id, note_id, stream_type, media_type, last_chunk_id)
+        resp = send_signal(jwt_token, server_url, '/command', stop_signal, session)
+        if not resp.ok:
+            return False, stream_id
+
+        completion_signal = create_completion_signal(stream_id)
+        resp = send_signal(jwt_token, server_url, '/streamuploadcompletion', completion_signal, session)
+        if not resp.ok:
+            return False, stream_id
 
     return True, stream_id
@@ -1,5 +1,5 @@
 # pylint: disable=no-member, attribute-defined-outside-init
-from utils.upload_go_audio.nrt_core import upload_nrt_file
+from utils.upload_go_audio.nrt_core import upload_nrt_file, DEFAULT_CHUNK_SIZE
 from utils.upload_go_audio.authentication import get_auth_token
 import pytest
 import jwt
@@ -21,8 +21,9 @@ def upload_audio_to_go_note(note_id, file_path, username=None, password=None, au
         doc_id = decoded.get("guid")
         print("Lynx Provider")
 
+    chunk_size = int(pytest.configs.get_config('nrt_chunk_size') or DEFAULT_CHUNK_SIZE)
     success, stream_id = upload_nrt_file(pytest.configs.get_config('file_upload_server_url'), str(doc_id), note_id, 'visit',
-                              'audio', file_path, token)
+                              'audio', file_path, token, chunk_size)
 
     if success:
         print("Uploaded successfully")
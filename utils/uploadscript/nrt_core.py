@@ -1,10 +1,15 @@
 import base64
 import datetime
 import json
+import os
+import struct
 import uuid
 
 import requests
 
+DEFAULT_CHUNK_SIZE = 0                   # 0: the whole media file in a single '/chunk' request
+DEFAULT_CHUNK_DURATION = 5000000000      # nanoseconds
+
 
 def timestamp_millisec64():
     return int((datetime.datetime.utcnow() - datetime.datetime(1970, 1, 1)).total_seconds() * 1000) 
@@ -23,7 +28,7 @@ def create_start_signal(stream_id, doc_id, note_id, stream_type, media_type):
     start_payload = json.dumps(start)
     return start_payload
 
-def create_stop_signal(stream_id, doc_id, note_id, stream_type, media_type):
+def create_stop_signal(stream_id, doc_id, note_id, stream_type, media_type, last_chunk_id=1):
     stop = {
         'name': "stop",
         'streamId':  stream_id,
@@ -33,37 +38,123 @@ def create_stop_signal(stream_id, doc_id, note_id, stream_type, media_type):
         'starttime': timestamp_millisec64(),
         'mediatype': media_type,
         'sessionDuration': 50000,
-        'lastChunkId': 1,
+        'lastChunkId': last_chunk_id,
         'endtime': timestamp_millisec64()
     }
 
     stop_payload = json.dumps(stop)
     return stop_payload
 
-def create_chunk_signal(file_path, stream_id, stream_type):
-    with open(file_path, "rb") as image_file:
-        encoded_file = base64.b64encode(image_file.read())
-
+def iter_file_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield (sequence_number, chunk_bytes) of the media file. By default (chunk_size 0 or None) the whole file
+    is a single chunk. A chunk_size in bytes cuts the file into raw byte slices, reading at most chunk_size
+    bytes at a time: only the first slice holds the MP4 headers, so the others can't be decoded on their
+    own. Byte slicing is meant for load testing the upload path (see load_generator), not for transcription.
+    """
+    with open(file_path, "rb") as media_file:
+        if not chunk_size:
+            yield 1, media_file.read()
+            return
+        sequence_number = 0
+        while True:
+            chunk_bytes = media_file.read(chunk_size)
+            if not chunk_bytes:
+                break
+            sequence_number += 1
+            yield sequence_number, chunk_bytes
+
+
+def mp4_duration_ns(file_path):
+    """
+    Duration of an MP4 file in nanoseconds, read from its 'moov/mvhd' box without loading the media.
+    Returns None if the file isn't a valid MP4 file (e.g. truncated) or has no movie header.
+    """
+    def read(media_file, size):
+        data = media_file.read(size)
+        if len(data) < size:
+            raise EOFError
+        return data
+
+    def find_box(media_file, box_type, end):
+        while media_file.tell() + 8 <= end:
+            box_start = media_file.tell()
+            size, found_type = struct.unpack('>I4s', read(media_file, 8))
+            if size == 1:
+                size = struct.unpack('>Q', read(media_file, 8))[0]
+            elif size == 0:
+                size = end - box_start
+            if size < 8 or box_start + size > end:
+                return None
+            if found_type == box_type:
+                return box_start + size
+            media_file.seek(box_start + size)
+        return None
+
+    with open(file_path, "rb") as media_file:
+        try:
+            moov_end = find_box(media_file, b'moov', os.path.getsize(file_path))
+            mvhd_end = find_box(media_file, b'mvhd', moov_end) if moov_end else None
+            if mvhd_end is None:
+                return None
+            version = read(media_file, 4)[0]
+            header_format = '>QQIQ' if version == 1 else '>IIII'
+            if media_file.tell() + struct.calcsize(header_format) > mvhd_end:
+                return None
+            _, _, timescale, duration = struct.unpack(header_format, read(media_file, struct.calcsize(header_format)))
+        except EOFError:
+            return None
+    return duration * 1000000000 // timescale if timescale else None
+
+
+def media_ns_per_byte(file_path):
+    """
+    Average media duration per byte of the file. Exact for the whole file; for byte slices (see
+    iter_file_chunks) only an estimate, as the slices aren't cut at media boundaries.
+    Returns None when the duration of the file is unknown (non MP4 files).
+    """
+    duration = mp4_duration_ns(file_path)
+    size = os.path.getsize(file_path)
+    return duration / size if duration and size else None
+
+
+def chunk_duration_ns(chunk_length, ns_per_byte=None):
+    """
+    Duration of a chunk of chunk_length bytes, DEFAULT_CHUNK_DURATION if the media duration per byte is unknown.
+    """
+    return round(chunk_length * ns_per_byte) if ns_per_byte else DEFAULT_CHUNK_DURATION
+
+
+def create_chunk_payload(chunk_bytes, stream_id, stream_type, sequence_number=1, chunk_duration=DEFAULT_CHUNK_DURATION):
     chunk = {
         'retentionDuration' : 604800000000000,
         'streamId' : stream_id,
         'type' : stream_type,
-        'fileName' : "0000001.mp4",
-        'sequenceNumber' : 1,
+        'fileName' : f"{sequence_number:07d}.mp4",
+        'sequenceNumber' : sequence_number,
         'initTime' : timestamp_millisec64(),
-        'chunkDuration' : 5000000000,
-        'file': encoded_file.decode("utf-8")
+        'chunkDuration' : chunk_duration,
+        'file': base64.b64encode(chunk_bytes).decode("utf-8")
     }
 
     chunk_payload = json.dumps(chunk)
     return chunk_payload
 
-def send_signal(jwt_token, server_url, end_point, payload):
+def create_chunk_signal(file_path, stream_id, stream_type):
+    """
+    Single chunk payload holding the whole media file, declaring the duration of the file.
+    """
+    with open(file_path, "rb") as media_file:
+        content = media_file.read()
+    return create_chunk_payload(content, stream_id, stream_type,
+                                chunk_duration=chunk_duration_ns(len(content), media_ns_per_byte(file_path)))
+
+def send_signal(jwt_token, server_url, end_point, payload, session=None):
     headers = {'Content-type': 'application/json',
                'Accept': 'text/plain',
                'Authorization': 'Bearer ' + jwt_token}
 
-    response = requests.post(server_url+end_point, data=payload, headers=headers)
+    response = (session or requests).post(server_url+end_point, data=payload, headers=headers)
     if response.ok:
         print(end_point + " signal sent", len(payload))
     else:
@@ -71,29 +162,47 @@ def send_signal(jwt_token, server_url, end_point, payload):
 
     return response
 
-def upload_nrt_file(server_url, doc_id, note_id, stream_type, media_type, file_path, jwt_token):
+def send_chunks(jwt_token, server_url, file_path, stream_id, stream_type, chunk_size=DEFAULT_CHUNK_SIZE, session=None):
+    """
+    Send the media file to the '/chunk' endpoint, as a single chunk by default or in chunk_size byte slices
+    (see iter_file_chunks), each chunk declaring the share of the media duration matching its byte count.
+    Returns the sequence number of the last chunk sent or None if sending any chunk failed.
+    """
+    last_chunk_id = None
+    ns_per_byte = media_ns_per_byte(file_path)
+    for sequence_number, chunk_bytes in iter_file_chunks(file_path, chunk_size):
+        chunk_signal = create_chunk_payload(chunk_bytes, stream_id, stream_type, sequence_number,
+                                            chunk_duration_ns(len(chunk_bytes), ns_per_byte))
+        resp = send_signal(jwt_token, server_url, '/chunk', chunk_signal, session)
+        if not resp.ok:
+            return None
+        last_chunk_id = sequence_number
+
+    return last_chunk_id
+
+def upload_nrt_file(server_url, doc_id, note_id, stream_type, media_type, file_path, jwt_token, chunk_size=DEFAULT_CHUNK_SIZE):
     id = str(uuid.uuid4())
     stream_id = doc_id + '-' + note_id + '-' + id
     print('stream_id', stream_id)
 
-    start_signal = create_start_signal(stream_id, doc_id, note_id, stream_type, media_type)
-    resp = send_signal(jwt_token, server_url, '/command', start_signal)
-    actual_bool=True
-    if not resp.ok:
-        actual_bool = False
-        return actual_bool , stream_id
-
-    chunk_signal = create_chunk_signal(file_path, stream_id, stream_type)
-    resp = send_signal(jwt_token, server_url, '/chunk', chunk_signal)
-    if not resp.ok:
-        actual_bool = False
-        return actual_bool, stream_id
-
-    stop_signal = create_stop_signal(stream_id, doc_id, note_id, stream_type, media_type)
-    resp = send_signal(jwt_token, server_url, '/command', stop_signal)
-    if not resp.ok:
-        actual_bool = False
-        return actual_bool, stream_id
+    with requests.Session() as session:
+        start_signal = create_start_signal(stream_id, doc_id, note_id, stream_type, media_type)
+        resp = send_signal(jwt_token, server_url, '/command', start_signal, session)
+        actual_bool=True
+        if not resp.ok:
+            actual_bool = False
+            return actual_bool , stream_id
+
+        last_chunk_id = send_chunks(jwt_token, server_url, file_path, stream_id, stream_type, chunk_size, session)
+        if last_chunk_id is None:
+            actual_bool = False
+            return actual_bool, stream_id
+
+        stop_signal = create_stop_signal(stream_id, doc_id, note_id, stream_type, media_type, last_chunk_id)
+        resp = send_signal(jwt_token, server_url, '/command', stop_signal, session)
+        if not resp.ok:
+            actual_bool = False
+            return actual_bool, stream_id
 
     return actual_bool, stream_id
 